@@ -0,0 +1,189 @@
+"""
+Compression benchmark for the ClickUp MCP Server
+
+Measures the bandwidth/CPU tradeoff of gzip, brotli and zstd on synthetic
+workspaces, for both sides of the server:
+
+- Upstream: raw ClickUp task page JSON (what Accept-Encoding negotiates)
+- Downstream: the Markdown that tools send to MCP clients over /mcp
+
+No ClickUp account or network access is needed.
+
+Usage:
+    python benchmarks/compression_benchmark.py
+    python benchmarks/compression_benchmark.py --lists 20 --tasks 100 --fields 15
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from typing import Callable, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from server import format_task  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+STATUSES = ["to do", "in progress", "review", "blocked", "done"]
+WORDS = (
+    "client onboarding invoice review campaign launch audit pipeline migration "
+    "follow up contract renewal design feedback sprint backlog report analytics"
+).split()
+
+
+def synthetic_task(task_id: int, list_id: str, fields: int, rng: random.Random) -> dict:
+    """A task shaped like ClickUp's /list/{id}/task payload."""
+    options = [{"id": f"opt-{i}", "name": f"Option {i}", "orderindex": i} for i in range(6)]
+    custom_fields = []
+    for index in range(fields):
+        kind = ("drop_down", "currency", "short_text", "date", "labels")[index % 5]
+        value = {
+            "drop_down": rng.randrange(6),
+            "currency": str(rng.randint(100, 50000)),
+            "short_text": " ".join(rng.choices(WORDS, k=4)),
+            "date": str(1735689600000 + rng.randrange(365) * 86_400_000),
+            "labels": rng.sample([o["id"] for o in options], 2)
+        }[kind]
+        custom_fields.append({
+            "id": f"field-{index:04d}-{list_id}",
+            "name": f"{kind.replace('_', ' ').title()} {index}",
+            "type": kind,
+            "type_config": {"options": options} if kind in ("drop_down", "labels") else {},
+            "value": value
+        })
+    return {
+        "id": f"86a{task_id:06x}",
+        "name": " ".join(rng.choices(WORDS, k=5)).capitalize(),
+        "text_content": " ".join(rng.choices(WORDS, k=40)),
+        "status": {"status": rng.choice(STATUSES), "type": "custom", "color": "#4194f6"},
+        "date_created": str(1735689600000 + rng.randrange(10**9)),
+        "date_updated": str(1735689600000 + rng.randrange(10**9)),
+        "due_date": str(1735689600000 + rng.randrange(10**9)) if rng.random() < 0.6 else None,
+        "creator": {"id": rng.randrange(50), "username": f"user{rng.randrange(50)}"},
+        "assignees": [
+            {"id": user, "username": f"user{user}", "email": f"user{user}@example.com"}
+            for user in rng.sample(range(50), rng.randint(0, 3))
+        ],
+        "watchers": [{"id": user, "username": f"user{user}"} for user in rng.sample(range(50), 3)],
+        "priority": {"priority": rng.choice(["urgent", "high", "normal", "low"])},
+        "tags": [{"name": tag} for tag in rng.sample(WORDS, 2)],
+        "list": {"id": list_id, "name": f"List {list_id}"},
+        "url": f"https://app.clickup.com/t/86a{task_id:06x}",
+        "custom_fields": custom_fields
+    }
+
+
+def synthetic_workspace(lists: int, tasks: int, fields: int, seed: int) -> list[list[dict]]:
+    """One page of tasks per list."""
+    rng = random.Random(seed)
+    return [
+        [synthetic_task(index * tasks + t, str(900000 + index), fields, rng) for t in range(tasks)]
+        for index in range(lists)
+    ]
+
+
+def codecs() -> list[tuple[str, Callable[[bytes], bytes], Callable[[bytes], bytes]]]:
+    """(name, compress, decompress) for every codec available here."""
+    available = [
+        ("gzip-1", lambda b: gzip.compress(b, 1), gzip.decompress),
+        ("gzip-6", lambda b: gzip.compress(b, 6), gzip.decompress),
+        ("gzip-9", lambda b: gzip.compress(b, 9), gzip.decompress)
+    ]
+    if brotli:
+        available += [
+            ("br-4", lambda b: brotli.compress(b, quality=4), brotli.decompress),
+            ("br-11", lambda b: brotli.compress(b, quality=11), brotli.decompress)
+        ]
+    if zstandard:
+        available += [
+            ("zstd-3", zstandard.ZstdCompressor(level=3).compress,
+             zstandard.ZstdDecompressor().decompress),
+            ("zstd-19", zstandard.ZstdCompressor(level=19).compress,
+             zstandard.ZstdDecompressor().decompress)
+        ]
+    return available
+
+
+def measure(payloads: list[bytes], repeat: int) -> list[tuple[str, int, int, float, float]]:
+    """(codec, raw bytes, compressed bytes, compress ms, decompress ms) totals."""
+    raw = sum(len(p) for p in payloads)
+    results = []
+    for name, compress, decompress in codecs():
+        compressed_total, compress_s, decompress_s = 0, 0.0, 0.0
+        for payload in payloads:
+            started = time.perf_counter()
+            for _ in range(repeat):
+                compressed = compress(payload)
+            compress_s += (time.perf_counter() - started) / repeat
+            started = time.perf_counter()
+            for _ in range(repeat):
+                decompress(compressed)
+            decompress_s += (time.perf_counter() - started) / repeat
+            compressed_total += len(compressed)
+        results.append((name, raw, compressed_total, compress_s * 1000, decompress_s * 1000))
+    return results
+
+
+def print_table(title: str, results: list[tuple[str, int, int, float, float]],
+                link_mbps: Optional[float]) -> None:
+    print(f"\n## {title}\n")
+    header = "| Codec | Raw KB | Sent KB | Ratio | Compress ms | Decompress ms |"
+    if link_mbps:
+        header += f" Transfer ms @ {link_mbps:g} Mbit/s |"
+    print(header)
+    print("|" + "---|" * (header.count("|") - 1))
+    if link_mbps:
+        raw = results[0][1]
+        print(f"| none | {raw / 1024:.0f} | {raw / 1024:.0f} | 1.00 | 0 | 0 "
+              f"| {raw * 8 / (link_mbps * 1000):.0f} |")
+    for name, raw, sent, compress_ms, decompress_ms in results:
+        row = (f"| {name} | {raw / 1024:.0f} | {sent / 1024:.0f} | {raw / sent:.2f} "
+               f"| {compress_ms:.1f} | {decompress_ms:.1f} |")
+        if link_mbps:
+            row += f" {sent * 8 / (link_mbps * 1000) + compress_ms + decompress_ms:.0f} |"
+        print(row)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lists", type=int, default=10, help="Lists in the synthetic workspace")
+    parser.add_argument("--tasks", type=int, default=100, help="Tasks per list (one page)")
+    parser.add_argument("--fields", type=int, default=10, help="Custom fields per task")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions per payload")
+    parser.add_argument("--link-mbps", type=float, default=50.0,
+                        help="Link speed for the end-to-end estimate (0 to skip)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    workspace = synthetic_workspace(args.lists, args.tasks, args.fields, args.seed)
+    print("# Compression Benchmark\n")
+    print(f"{args.lists} lists x {args.tasks} tasks x {args.fields} custom fields "
+          f"(brotli: {'yes' if brotli else 'not installed'}, "
+          f"zstd: {'yes' if zstandard else 'not installed'})")
+
+    upstream = [json.dumps({"tasks": page, "last_page": True}).encode() for page in workspace]
+    print_table("Upstream: ClickUp task pages (JSON)", measure(upstream, args.repeat), args.link_mbps)
+
+    downstream = [
+        "".join(format_task(task, i, show_list=True) for i, task in enumerate(page, 1)).encode()
+        for page in workspace
+    ]
+    print_table("Downstream: tool output (Markdown over /mcp)", measure(downstream, args.repeat), args.link_mbps)
+
+
+if __name__ == "__main__":
+    main()
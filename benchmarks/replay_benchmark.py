@@ -0,0 +1,90 @@
+"""
+Replay benchmark for the ClickUp MCP Server
+
+Replays the tool calls of a recorded cassette (CLICKUP_CASSETTE_MODE=record)
+against the recorded ClickUp responses, with no network access, and reports
+per-tool latency. Use it to profile real traffic shapes offline and to
+compare changes against the same workload.
+
+Usage:
+    # 1. Record a session against the live API
+    CLICKUP_CASSETTE_MODE=record CLICKUP_CASSETTE_PATH=audit.ndjson.gz python server.py
+
+    # 2. Replay it at full speed, or with the recorded upstream latency
+    python benchmarks/replay_benchmark.py audit.ndjson.gz
+    python benchmarks/replay_benchmark.py audit.ndjson.gz --timing --rounds 5 --sessions 4
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cassette", help="Recorded cassette (.ndjson.gz)")
+    parser.add_argument("--timing", action="store_true", help="Replay with recorded upstream latency")
+    parser.add_argument("--rounds", type=int, default=3, help="Times to replay the session")
+    parser.add_argument("--sessions", type=int, default=1, help="Concurrent copies of the session per round")
+    parser.add_argument("--warm", action="store_true", help="Keep response/render caches between rounds")
+    return parser.parse_args()
+
+
+async def run_session(server, tool_calls: list[dict], timings: dict[str, list[float]]) -> None:
+    for call in tool_calls:
+        tool = getattr(server, call["name"], None)
+        if tool is None:
+            continue
+        started = time.perf_counter()
+        await tool(*call.get("args", []), **call.get("kwargs", {}))
+        timings.setdefault(call["name"], []).append((time.perf_counter() - started) * 1000)
+
+
+async def main() -> None:
+    args = parse_args()
+
+    # The server reads its cassette settings at import time
+    os.environ["CLICKUP_CASSETTE_MODE"] = "replay"
+    os.environ["CLICKUP_CASSETTE_PATH"] = args.cassette
+    os.environ["CLICKUP_CASSETTE_REPLAY_TIMING"] = "true" if args.timing else "false"
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    import server
+
+    tool_calls = server.cassette.tool_calls
+    if not tool_calls:
+        sys.exit(f"No tool calls recorded in {args.cassette}")
+
+    print("# Replay Benchmark\n")
+    print(f"{len(tool_calls)} tool calls, {sum(len(r) for r in server.cassette.responses.values())} "
+          f"recorded responses, {args.rounds} round(s) x {args.sessions} session(s), "
+          f"{'recorded' if args.timing else 'no'} upstream latency\n")
+
+    timings: dict[str, list[float]] = {}
+    wall = []
+    for _ in range(args.rounds):
+        if not args.warm:
+            server.response_cache.entries.clear()
+            server.render_cache.entries.clear()
+            server.render_cache.chars = 0
+        started = time.perf_counter()
+        await asyncio.gather(*(run_session(server, tool_calls, timings) for _ in range(args.sessions)))
+        wall.append((time.perf_counter() - started) * 1000)
+
+    print("| Tool | Calls | p50 ms | p95 ms | Max ms |")
+    print("|---|---|---|---|---|")
+    for name, values in sorted(timings.items(), key=lambda item: -sum(item[1])):
+        values = np.asarray(values)
+        p50, p95 = np.percentile(values, [50, 95])
+        print(f"| {name} | {values.size} | {p50:.1f} | {p95:.1f} | {values.max():.1f} |")
+
+    print(f"\n**Round wall time**: median {np.median(wall):.0f} ms, best {min(wall):.0f} ms")
+    status = server.cassette.status()
+    print(f"**Responses replayed**: {status['replayed']}, **missing from cassette**: {status['misses']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
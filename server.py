@@ -5,27 +5,1058 @@ A Model Context Protocol server that enables LLMs to interact with ClickUp works
 spaces, lists, and custom fields. Uses stdio transport for Claude Desktop integration.
 """
 
+import asyncio
+import atexit
+import csv
+import gzip
+import hashlib
+import json
+import logging
 import os
-from typing import Any, Optional
+import random
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import partial, wraps
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, Optional
 from urllib.parse import urljoin
 
 import httpx
+import numpy as np
 from fastmcp import FastMCP
 
 
 # Constants
 API_BASE_URL = "https://api.clickup.com/api/v2"
 CHARACTER_LIMIT = 25000
+REQUEST_TIMEOUT = 30.0
+CASSETTE_MODE = os.getenv("CLICKUP_CASSETTE_MODE", "").lower()  # "", "record" or "replay"
+CASSETTE_PATH = os.getenv("CLICKUP_CASSETTE_PATH", "clickup_cassette.ndjson.gz")
+CASSETTE_REPLAY_TIMING = os.getenv("CLICKUP_CASSETTE_REPLAY_TIMING", "false").lower() in ("1", "true", "yes")
+MAX_RESPONSE_BYTES = int(os.getenv("CLICKUP_MAX_RESPONSE_BYTES", str(8 * 1024 * 1024)))
+# Task pages and time entries legitimately run larger than hierarchy reads
+RESPONSE_BYTE_LIMITS = {
+    "task": 24 * 1024 * 1024,
+    "task_ids": 24 * 1024 * 1024,
+    "time_entries": 24 * 1024 * 1024
+}
+TOOL_DEADLINE_SECONDS = float(os.getenv("CLICKUP_TOOL_DEADLINE_SECONDS", "25"))
+LONG_TOOL_DEADLINE_SECONDS = float(os.getenv("CLICKUP_LONG_TOOL_DEADLINE_SECONDS", "300"))
+TOOL_DEADLINE_GRACE = 2.0  # time left to format partial results after the deadline
+MAX_CONCURRENT_REQUESTS = 10
+TASK_PAGE_SIZE = 100  # ClickUp returns at most 100 tasks per page
+VIEW_PAGE_SIZE = 30  # view task pages are smaller
+PAGE_CONCURRENCY = 4
+RATE_LIMIT_PER_MINUTE = int(os.getenv("CLICKUP_RATE_LIMIT_PER_MINUTE", "100"))
+UPSTREAM_CONCURRENCY = int(os.getenv("CLICKUP_UPSTREAM_CONCURRENCY", "20"))
+UPSTREAM_QUEUE_SIZE = int(os.getenv("CLICKUP_UPSTREAM_QUEUE_SIZE", "200"))
+TOOL_CONCURRENCY = int(os.getenv("CLICKUP_TOOL_CONCURRENCY", "16"))
+TOOL_QUEUE_SIZE = int(os.getenv("CLICKUP_TOOL_QUEUE_SIZE", "32"))
+TOOL_QUEUE_WAIT_SECONDS = float(os.getenv("CLICKUP_TOOL_QUEUE_WAIT_SECONDS", "10"))
+HEDGE_REQUESTS = os.getenv("CLICKUP_HEDGE_REQUESTS", "false").lower() in ("1", "true", "yes")
+HEDGE_PERCENTILE = float(os.getenv("CLICKUP_HEDGE_PERCENTILE", "0.95"))
+HEDGE_MAX_RATIO = float(os.getenv("CLICKUP_HEDGE_MAX_RATIO", "0.05"))
+HEDGE_MIN_SAMPLES = 20  # latencies needed per endpoint before hedging it
+HEDGE_MIN_DELAY = 0.25  # never hedge sooner than this, in seconds
+BREAKER_FAILURE_RATIO = float(os.getenv("CLICKUP_BREAKER_FAILURE_RATIO", "0.5"))
+BREAKER_MIN_REQUESTS = int(os.getenv("CLICKUP_BREAKER_MIN_REQUESTS", "10"))
+BREAKER_COOLDOWN_SECONDS = float(os.getenv("CLICKUP_BREAKER_COOLDOWN_SECONDS", "30"))
+BREAKER_WINDOW_SECONDS = 60.0
+BREAKER_SLOW_SECONDS = 10.0  # a request cancelled after this long counts as a timeout
+CACHE_TTL_SECONDS = float(os.getenv("CLICKUP_CACHE_TTL_SECONDS", "300"))
+TASK_CACHE_TTL_SECONDS = float(os.getenv("CLICKUP_TASK_CACHE_TTL_SECONDS", "30"))
+CACHE_STALE_SECONDS = float(os.getenv("CLICKUP_CACHE_STALE_SECONDS", "3600"))
+CACHE_MAX_ENTRIES = int(os.getenv("CLICKUP_CACHE_MAX_ENTRIES", "2000"))
+PREFETCH = os.getenv("CLICKUP_PREFETCH", "false").lower() in ("1", "true", "yes")
+PREFETCH_CONCURRENCY = 2
+PREFETCH_MAX_PENDING = 50
+PREFETCH_RESERVE = float(os.getenv("CLICKUP_PREFETCH_RESERVE", "0.5"))  # share of the bucket prefetch never touches
+WARMUP_TEAMS = os.getenv("CLICKUP_WARMUP_TEAMS", "")
+WARMUP_SPACES = os.getenv("CLICKUP_WARMUP_SPACES", "")
+WARMUP_FILE = os.getenv("CLICKUP_WARMUP_FILE", "")
+WARMUP_TIMEOUT_SECONDS = float(os.getenv("CLICKUP_WARMUP_TIMEOUT_SECONDS", "60"))
+WARMUP_RESERVE = float(os.getenv("CLICKUP_WARMUP_RESERVE", "0.5"))  # share of the bucket warmup leaves to tool calls
+MEMBER_CACHE_TTL_SECONDS = float(os.getenv("CLICKUP_MEMBER_CACHE_TTL_SECONDS", "900"))
+MEMBER_RETRY_SECONDS = 30  # wait after a failed member load before trying /team again
+TASK_STORE_TTL_SECONDS = float(os.getenv("CLICKUP_TASK_STORE_TTL_SECONDS", "600"))
+TASK_STORE_MAX = 8  # columnar task stores kept in memory
+NUMERIC_FIELD_TYPES = {"number", "currency", "rating", "manual_progress", "automatic_progress"}
+DAY_MS = 86_400_000
+WEEK_MS = 7 * DAY_MS
+TIME_IN_STATUS_BATCH = 100  # task IDs per bulk time-in-status request
+TIME_IN_STATUS_CONCURRENCY = 4
+TIME_IN_STATUS_MAX_TASKS = 10000
+TIME_ENTRY_WINDOW_DAYS = 7  # days per concurrent time entry request
+TIME_ENTRY_MAX_DAYS = 366
+BULK_CONCURRENCY = 5
+BULK_MAX_ATTEMPTS = 4
+BULK_MAX_TASKS = 1000
+BULK_IDEMPOTENCY_KEYS = 100  # batches remembered for safe retries
+IMPORT_WINDOW = 50  # rows read ahead of the create requests
+IMPORT_DIR = os.getenv("CLICKUP_IMPORT_DIR")  # base directory for import files
+EXPORT_DIR = os.getenv("CLICKUP_EXPORT_DIR")  # base directory for export output
+# Allow any path while the base directory is unset (default: off over HTTP)
+UNRESTRICTED_FILE_ACCESS = os.getenv("CLICKUP_UNRESTRICTED_FILE_ACCESS", "true").lower() in ("1", "true", "yes")
+EXPORT_LIST_CONCURRENCY = 3
+EXPORT_PAGE_CONCURRENCY = 2
+SNAPSHOT_DIR = os.getenv("CLICKUP_SNAPSHOT_DIR", ".clickup_snapshots")
+RENDER_CACHE_MAX_CHARS = int(os.getenv("CLICKUP_RENDER_CACHE_MAX_CHARS", "8000000"))
+FIELD_DECODER_MAX = 5000  # custom field definitions with prebuilt decoders
+FIELD_VALUE_MAX_CHARS = 80
+LOOP_MONITOR = os.getenv("CLICKUP_LOOP_MONITOR", "true").lower() in ("1", "true", "yes")
+LOOP_MONITOR_INTERVAL = 0.1  # seconds between lag probes
+LOOP_STALL_MS = float(os.getenv("CLICKUP_LOOP_STALL_MS", "100"))
+SLOW_CALLBACK_MS = float(os.getenv("CLICKUP_SLOW_CALLBACK_MS", "50"))
+LOG_LEVEL = os.getenv("CLICKUP_LOG_LEVEL", "WARNING").upper()
+# With the GIL, extra workers only add contention; free-threaded builds run them in parallel
+GIL_ENABLED = getattr(sys, "_is_gil_enabled", lambda: True)()
+OFFLOAD_WORKERS = int(os.getenv("CLICKUP_OFFLOAD_WORKERS", "1" if GIL_ENABLED else str(os.cpu_count() or 1)))
+OFFLOAD_MIN_ITEMS = int(os.getenv("CLICKUP_OFFLOAD_MIN_ITEMS", "50"))
 
 
 # Initialize FastMCP server
 mcp = FastMCP("clickup-mcp-server")
+logger = logging.getLogger("clickup-mcp")
+
+# Completed bulk update operations, keyed by (idempotency key, changes hash)
+completed_bulk_updates: dict[tuple[str, str], set[str]] = {}
+
+
+# Rate Limiting
+class RateLimitError(ValueError):
+    """Raised when ClickUp answers 429; carries the suggested wait in seconds."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class UpstreamError(ValueError):
+    """Raised for ClickUp error responses not covered by a more specific error."""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every upstream request in this process.
+
+    The bucket holds one minute of budget (RATE_LIMIT_PER_MINUTE tokens) and
+    refills continuously. When ClickUp reports a 429, `pause` holds back all
+    callers until the reset time instead of letting each one retry blindly.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(max(1, per_minute))
+        self.tokens = self.capacity
+        self.refill_rate = self.capacity / 60.0
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.refill_rate)
+
+    def try_acquire(self, reserve: float = 0.0) -> bool:
+        """
+        Take a token only if one is free right now and at least `reserve`
+        tokens stay in the bucket. Never waits; used for optional requests.
+        """
+        if time.monotonic() < self.paused_until or self.lock.locked():
+            return False
+        self._refill()
+        if self.tokens - 1 < reserve:
+            return False
+        self.tokens -= 1
+        return True
+
+    async def acquire_spare(self, reserve: float) -> None:
+        """
+        Wait for a token that leaves at least `reserve` tokens in the bucket.
+        For background work: it never queues ahead of waiting callers.
+        """
+        while not self.try_acquire(reserve=reserve):
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+            else:
+                await asyncio.sleep(max(0.05, (reserve + 1 - self.tokens) / self.refill_rate))
+
+    def pause(self, seconds: float) -> None:
+        """Stop issuing requests for `seconds` (e.g. after a 429)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+rate_limiter = RateLimiter(RATE_LIMIT_PER_MINUTE)
+# Set for background work (startup warmup) that must not compete with tool calls
+background_request: ContextVar[bool] = ContextVar("background_request", default=False)
+
+
+# Admission Control
+class OverloadedError(RateLimitError):
+    """Raised when a concurrency limit's wait queue is full; carries a retry hint."""
+
+
+class AdmissionLimiter:
+    """
+    Concurrency limit with a bounded wait queue.
+
+    Up to `limit` holders run at once and up to `queue_size` more wait for
+    a slot (at most `max_wait` seconds, if set). Anyone beyond that is
+    rejected immediately with OverloadedError, whose retry hint is derived
+    from the recent average time a slot is held.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, max_wait: Optional[float] = None):
+        self.name = name
+        self.limit = max(1, limit)
+        self.queue_size = max(0, queue_size)
+        self.max_wait = max_wait
+        self.semaphore = asyncio.Semaphore(self.limit)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.avg_hold = 1.0  # exponentially weighted, in seconds
+
+    def busy(self) -> bool:
+        return self.active >= self.limit
+
+    def retry_after(self) -> float:
+        return round(max(1.0, self.avg_hold * (self.waiting + 1) / self.limit), 1)
+
+    def reject(self) -> OverloadedError:
+        self.rejected += 1
+        retry_after = self.retry_after()
+        return OverloadedError(
+            f"Server busy: {self.active} {self.name} running and {self.waiting} queued. "
+            f"Retry in about {retry_after:.0f}s.",
+            retry_after=retry_after
+        )
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one slot for the duration of the block, or raise OverloadedError."""
+        if self.busy() and self.waiting >= self.queue_size:
+            raise self.reject()
+        self.waiting += 1
+        try:
+            async with asyncio.timeout(self.max_wait):
+                await self.semaphore.acquire()
+        except TimeoutError:
+            raise self.reject()
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        self.admitted += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.avg_hold = 0.9 * self.avg_hold + 0.1 * (time.monotonic() - started)
+            self.active -= 1
+            self.semaphore.release()
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.waiting,
+            "queue_size": self.queue_size,
+            "admitted": self.admitted,
+            "rejected": self.rejected
+        }
+
+
+upstream_limiter = AdmissionLimiter("upstream requests", UPSTREAM_CONCURRENCY, UPSTREAM_QUEUE_SIZE)
+tool_limiter = AdmissionLimiter("tool calls", TOOL_CONCURRENCY, TOOL_QUEUE_SIZE, TOOL_QUEUE_WAIT_SECONDS)
+
+
+# Response Size Limits
+class ResponseTooLargeError(ValueError):
+    """Raised when a response body exceeds its endpoint class's byte ceiling."""
+
+
+# Oversized responses rejected, per endpoint class
+oversized_responses: dict[str, int] = {}
+# Bytes received on the wire vs. decoded body bytes, for the compression ratio
+transfer_stats = {"wire_bytes": 0, "body_bytes": 0}
+
+
+def response_byte_limit(template: str) -> int:
+    """
+    Byte ceiling for a response body from this endpoint template.
+
+    CLICKUP_MAX_RESPONSE_BYTES_<CLASS> (e.g. ..._TASK, ..._VIEW) overrides
+    the class default; other classes use CLICKUP_MAX_RESPONSE_BYTES.
+    """
+    kind = endpoint_class(template)
+    override = os.getenv(f"CLICKUP_MAX_RESPONSE_BYTES_{kind.upper()}")
+    if override and override.isdigit():
+        return int(override)
+    return RESPONSE_BYTE_LIMITS.get(kind, MAX_RESPONSE_BYTES)
+
+
+def reject_oversized(template: str, limit: int) -> ResponseTooLargeError:
+    kind = endpoint_class(template)
+    oversized_responses[kind] = oversized_responses.get(kind, 0) + 1
+    return ResponseTooLargeError(
+        f"Response from {template} exceeded {limit:,} bytes and was discarded. "
+        f"Narrow the request (fewer items per page or a smaller scope), or raise "
+        f"CLICKUP_MAX_RESPONSE_BYTES_{kind.upper()}."
+    )
+
+
+# Record / Replay
+class CassetteMissError(ValueError):
+    """Raised in replay mode when no recorded response matches a request."""
+
+
+# Response headers worth keeping in a cassette (rate limits drive behavior)
+CASSETTE_HEADERS = ("content-type", "retry-after", "x-ratelimit-limit", "x-ratelimit-remaining", "x-ratelimit-reset")
+
+
+class Cassette:
+    """
+    Records upstream exchanges to, or replays them from, a gzip NDJSON file.
+
+    In "record" mode every request/response pair is appended as one JSON
+    line: method, URL path and sorted query, a hash of the JSON body,
+    status, a few headers, the body and its latency. Tool calls are logged
+    too, so a session can be replayed end to end. The Authorization header
+    is never written and the API key is redacted from every line.
+
+    In "replay" mode nothing goes over the network: requests are matched
+    by key and served in recorded order (the last answer repeats), with
+    the recorded latency if CLICKUP_CASSETTE_REPLAY_TIMING is set.
+    """
+
+    def __init__(self, mode: str, path: str, replay_timing: bool = False):
+        self.mode = mode if mode in ("record", "replay") else ""
+        self.path = path
+        self.replay_timing = replay_timing
+        self.started = time.monotonic()
+        self.responses: dict[str, deque] = {}
+        self.tool_calls: list[dict] = []
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self.file = None
+        if self.mode == "replay":
+            self.load()
+
+    @staticmethod
+    def key(request: httpx.Request, json_data: Optional[dict]) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.url.params.multi_items()))
+        body = payload_hash(json_data) if json_data is not None else ""
+        return f"{request.method} {request.url.path}{'?' if query else ''}{query} {body}".strip()
+
+    def load(self) -> None:
+        """Index a recorded cassette; a truncated file (crash while recording) loads up to the break."""
+        with gzip.open(self.path, "rt", encoding="utf-8") as cassette:
+            try:
+                for line in cassette:
+                    entry = json.loads(line)
+                    if entry.get("type") == "tool":
+                        self.tool_calls.append(entry)
+                    else:
+                        self.responses.setdefault(entry["key"], deque()).append(entry)
+            except (EOFError, json.JSONDecodeError):
+                pass
+
+    def write(self, entry: dict) -> None:
+        if self.file is None:
+            self.file = gzip.open(self.path, "at", encoding="utf-8")
+            atexit.register(self.file.close)
+        line = json.dumps(entry, separators=(",", ":"), default=str)
+        api_key = os.getenv("CLICKUP_API_KEY")
+        if api_key:
+            line = line.replace(api_key, "[REDACTED]")
+        self.file.write(line + "\n")
+        # Sync flush keeps the compression dictionary and makes each line durable
+        self.file.flush()
+
+    def record(self, key: str, response: httpx.Response, body: bytes, latency: float) -> None:
+        self.recorded += 1
+        self.write({
+            "key": key,
+            "t": round(time.monotonic() - self.started, 3),
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in CASSETTE_HEADERS if name in response.headers},
+            "body": body.decode("utf-8", errors="replace"),
+            "latency": round(latency, 4)
+        })
+
+    def record_tool(self, name: str, args: tuple, kwargs: dict) -> None:
+        self.write({
+            "type": "tool",
+            "t": round(time.monotonic() - self.started, 3),
+            "name": name,
+            "args": list(args),
+            "kwargs": kwargs
+        })
+
+    async def replay(self, request: httpx.Request, json_data: Optional[dict]) -> httpx.Response:
+        key = self.key(request, json_data)
+        entries = self.responses.get(key)
+        if not entries:
+            self.misses += 1
+            raise CassetteMissError(f"No recorded response for {key} in {self.path}.")
+        entry = entries.popleft() if len(entries) > 1 else entries[0]
+        if self.replay_timing:
+            await asyncio.sleep(entry.get("latency", 0))
+        self.replayed += 1
+        return httpx.Response(
+            entry["status"],
+            headers=entry.get("headers", {}),
+            content=entry["body"].encode("utf-8"),
+            request=request
+        )
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode or "off",
+            "path": self.path if self.mode else None,
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses
+        }
+
+
+cassette = Cassette(CASSETTE_MODE, CASSETTE_PATH, CASSETTE_REPLAY_TIMING)
+
+
+# Request Hedging
+def endpoint_template(endpoint: str) -> str:
+    """Replace ID path segments with {id}, e.g. /list/123/task -> /list/{id}/task."""
+    return "/" + "/".join(
+        "{id}" if any(ch.isdigit() for ch in segment) else segment
+        for segment in endpoint.strip("/").split("/")
+    )
+
+
+class LatencyTracker:
+    """Recent response latencies per endpoint template."""
+
+    def __init__(self, window: int = 200):
+        self.samples: dict[str, deque] = {}
+        self.window = window
+
+    def record(self, template: str, seconds: float) -> None:
+        self.samples.setdefault(template, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, template: str, q: float) -> Optional[float]:
+        """The q-quantile of recent latencies, or None until enough samples exist."""
+        samples = self.samples.get(template)
+        if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class HedgeBudget:
+    """
+    Caps hedged requests at HEDGE_MAX_RATIO of all requests per minute, so
+    hedging never spends a meaningful share of the rate-limit budget.
+    """
+
+    def __init__(self, max_ratio: float):
+        self.max_ratio = max_ratio
+        self.window_start = time.monotonic()
+        self.requests = 0
+        self.hedges = 0
+        self.total_hedges = 0
+        self.hedge_wins = 0
+
+    def _roll(self) -> None:
+        if time.monotonic() - self.window_start >= 60:
+            self.window_start = time.monotonic()
+            self.requests = self.hedges = 0
+
+    def record_request(self) -> None:
+        self._roll()
+        self.requests += 1
+
+    def allow(self) -> bool:
+        self._roll()
+        if self.hedges + 1 > self.max_ratio * self.requests:
+            return False
+        self.hedges += 1
+        self.total_hedges += 1
+        return True
+
+
+latency_tracker = LatencyTracker()
+hedge_budget = HedgeBudget(HEDGE_MAX_RATIO)
+
+
+async def timed_send(
+    method: str,
+    url: str,
+    headers: dict,
+    params: Optional[dict],
+    json_data: Optional[dict],
+    template: str
+) -> httpx.Response:
+    """
+    Send a request and record its latency for the endpoint template.
+
+    The body is streamed and reading stops as soon as it passes the
+    endpoint class's byte ceiling, so one pathological response cannot
+    pull megabytes into memory.
+    """
+    if cassette.mode == "replay":
+        return await cassette.replay(httpx.Request(method, url, params=params), json_data)
+
+    limit = response_byte_limit(template)
+    started = time.monotonic()
+    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+        async with client.stream(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            json=json_data
+        ) as response:
+            declared = response.headers.get("Content-Length", "")
+            if declared.isdigit() and int(declared) > limit:
+                raise reject_oversized(template, limit)
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) > limit:
+                    raise reject_oversized(template, limit)
+            transfer_stats["wire_bytes"] += response.num_bytes_downloaded
+            transfer_stats["body_bytes"] += len(body)
+    latency = time.monotonic() - started
+    latency_tracker.record(template, latency)
+    if cassette.mode == "record":
+        cassette.record(Cassette.key(response.request, json_data), response, bytes(body), latency)
+
+    # The body is already decoded, so drop the headers describing the wire format
+    headers = [
+        (name, value) for name, value in response.headers.multi_items()
+        if name.lower() not in ("content-encoding", "content-length")
+    ]
+    return httpx.Response(
+        response.status_code,
+        headers=headers,
+        content=bytes(body),
+        request=response.request
+    )
+
+
+def retry_after_seconds(response: httpx.Response) -> float:
+    """Read the wait before retrying from ClickUp's rate limit headers."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    reset = response.headers.get("X-RateLimit-Reset")
+    if reset and reset.isdigit():
+        return max(1.0, float(reset) - time.time())
+    return 60.0 / max(1, RATE_LIMIT_PER_MINUTE) * 10
+
+
+# Circuit Breakers
+class CircuitOpenError(ValueError):
+    """Raised instead of calling ClickUp while an endpoint class's circuit is open."""
+
+
+def endpoint_class(template: str) -> str:
+    """Group endpoint templates by resource, e.g. /list/{id}/task -> task."""
+    segments = [segment for segment in template.strip("/").split("/") if segment != "{id}"]
+    return segments[-1] if segments else "root"
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint-class circuit breaker.
+
+    Closed: requests flow and outcomes are recorded over a rolling window.
+    Open: once the failure ratio (5xx, network errors, timeouts) reaches
+    BREAKER_FAILURE_RATIO over at least BREAKER_MIN_REQUESTS requests,
+    calls fail fast for BREAKER_COOLDOWN_SECONDS.
+    Half-open: after the cooldown one probe request is let through; success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = "closed"
+        self.outcomes: deque = deque()
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    def _trim(self) -> None:
+        cutoff = time.monotonic() - BREAKER_WINDOW_SECONDS
+        while self.outcomes and self.outcomes[0][0] < cutoff:
+            self.outcomes.popleft()
+
+    def failure_ratio(self) -> float:
+        self._trim()
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for _, ok in self.outcomes if not ok) / len(self.outcomes)
+
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_at + BREAKER_COOLDOWN_SECONDS - time.monotonic())
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError if this request must not be sent."""
+        if self.state == "open":
+            if self.retry_in() > 0:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    f"ClickUp API is failing for '{self.name}' requests, so the server "
+                    f"is failing fast. It will retry automatically in {self.retry_in():.0f}s."
+                )
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self.probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    f"ClickUp API is recovering for '{self.name}' requests; "
+                    "a probe request is in flight. Please retry in a few seconds."
+                )
+            self.probe_in_flight = True
+
+    def record(self, ok: bool) -> None:
+        if self.state == "half_open":
+            self.probe_in_flight = False
+            if ok:
+                self.state = "closed"
+                self.outcomes.clear()
+            else:
+                self._open()
+            return
+
+        self.outcomes.append((time.monotonic(), ok))
+        self._trim()
+        if (
+            self.state == "closed"
+            and len(self.outcomes) >= BREAKER_MIN_REQUESTS
+            and self.failure_ratio() >= BREAKER_FAILURE_RATIO
+        ):
+            self._open()
+
+    def release(self) -> None:
+        """Give up a half-open probe slot without an outcome (e.g. cancelled early)."""
+        if self.state == "half_open":
+            self.probe_in_flight = False
+
+    def _open(self) -> None:
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+
+
+circuit_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(template: str) -> CircuitBreaker:
+    """Get (or create) the breaker for an endpoint template's class."""
+    name = endpoint_class(template)
+    if name not in circuit_breakers:
+        circuit_breakers[name] = CircuitBreaker(name)
+    return circuit_breakers[name]
+
+
+# Response Cache
+CACHEABLE_TEMPLATES = {
+    "/user": CACHE_TTL_SECONDS,
+    "/team": CACHE_TTL_SECONDS,
+    "/team/{id}/space": CACHE_TTL_SECONDS,
+    "/space/{id}": CACHE_TTL_SECONDS,
+    "/space/{id}/folder": CACHE_TTL_SECONDS,
+    "/space/{id}/list": CACHE_TTL_SECONDS,
+    "/folder/{id}": CACHE_TTL_SECONDS,
+    "/list/{id}": CACHE_TTL_SECONDS,
+    "/list/{id}/field": CACHE_TTL_SECONDS
+}
+
+
+def cache_key(endpoint: str, params: Optional[dict]) -> tuple:
+    """Cache key for a GET request: endpoint plus normalized query parameters."""
+    return (endpoint, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+
+
+def cache_ttl_for(endpoint: str, params: Optional[dict]) -> Optional[float]:
+    """TTL for caching a GET of this endpoint, or None if it is not cacheable."""
+    template = endpoint_template(endpoint)
+    if template == "/list/{id}/task":
+        # Only the first page get_tasks shows; bulk task reads would flood the cache
+        key = cache_key(endpoint, params)
+        if any(key == cache_key(endpoint, task_page_params(0, subtasks)) for subtasks in (False, True)):
+            return TASK_CACHE_TTL_SECONDS
+        return None
+    return CACHEABLE_TEMPLATES.get(template)
+
+
+class ResponseCache:
+    """
+    TTL cache of hierarchy GET responses (spaces, folders, lists, fields,
+    first task pages).
+
+    Entries are fresh for their template's TTL and kept as stale fallbacks
+    for CACHE_STALE_SECONDS, which open circuit breakers may serve. Cached
+    payloads are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+
+    def get(self, key: tuple, max_age: float) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > max_age:
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: tuple, value: Any) -> None:
+        self.entries[key] = (time.monotonic(), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate_tasks(self) -> None:
+        """Drop cached task pages after a write."""
+        for key in [key for key in self.entries if endpoint_template(key[0]) == "/list/{id}/task"]:
+            del self.entries[key]
+
+
+response_cache = ResponseCache(CACHE_MAX_ENTRIES)
+
+
+class PrefetchSkipped(Exception):
+    """Raised when a prefetch request finds no spare rate-limit budget."""
+
+
+class Prefetcher:
+    """
+    Background warming of the response cache for the next hierarchy level.
+
+    Tools follow a fixed exploration order (user -> spaces -> folders/lists
+    -> list details -> tasks), so after one level is served the next one is
+    fetched at low priority: at most PREFETCH_CONCURRENCY requests at once,
+    a bounded number pending, and only with spare rate-limit tokens above
+    the PREFETCH_RESERVE share of the bucket. Anything over budget is dropped.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+        self.pending: set[tuple] = set()
+        self.tasks: set[asyncio.Task] = set()
+        self.completed = 0
+        self.skipped = 0
+
+    def schedule(self, requests: Iterable[tuple[str, Optional[dict]]]) -> None:
+        """Queue (endpoint, params) GETs to warm; no-op when disabled."""
+        if not self.enabled:
+            return
+        for endpoint, params in requests:
+            key = cache_key(endpoint, params)
+            ttl = cache_ttl_for(endpoint, params)
+            if key in self.pending or ttl is None or response_cache.get(key, ttl) is not None:
+                continue
+            if len(self.pending) >= PREFETCH_MAX_PENDING:
+                self.skipped += 1
+                continue
+            self.pending.add(key)
+            task = asyncio.create_task(self._fetch(key, endpoint, params))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _fetch(self, key: tuple, endpoint: str, params: Optional[dict]) -> None:
+        loop = asyncio.get_running_loop()
+        tool_deadline.set(loop.time() + REQUEST_TIMEOUT)
+        try:
+            async with self.semaphore:
+                await make_api_request(endpoint, params=params, prefetch=True)
+            self.completed += 1
+        except Exception:
+            self.skipped += 1
+        finally:
+            self.pending.discard(key)
+
+
+def task_page_params(page: int = 0, subtasks: bool = False) -> dict[str, Any]:
+    """Query parameters get_tasks uses for a task page."""
+    return {
+        "page": page,
+        "order_by": "created",
+        "reverse": "true",
+        "subtasks": str(subtasks).lower(),
+        "include_closed": "true"
+    }
+
+
+# Event Loop Monitor
+# Name of the tool whose code is running (for attributing loop stalls)
+current_tool: ContextVar[Optional[str]] = ContextVar("current_tool", default=None)
+
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class LoopMonitor:
+    """
+    Measures event-loop lag and the synchronous work that causes it.
+
+    A probe task sleeps LOOP_MONITOR_INTERVAL and records how late it wakes
+    up (scheduled vs. actual time) in a histogram; a wake-up later than
+    LOOP_STALL_MS is logged as a stall. Known CPU-heavy sections (JSON
+    decoding, formatters) run inside `blocking(label)`, which times them and
+    records any that hold the loop longer than SLOW_CALLBACK_MS together with
+    the tool that ran them, so a stall can be traced to its cause.
+    """
+
+    def __init__(self, enabled: bool = LOOP_MONITOR):
+        self.enabled = enabled
+        self.task: Optional[asyncio.Task] = None
+        self.histogram = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.recent: deque = deque(maxlen=600)  # last minute of lag samples
+        self.max_lag_ms = 0.0
+        self.stalls = 0
+        self.slow_sections: dict[str, dict[str, Any]] = {}
+        self.last_section: Optional[tuple[str, Optional[str], float, float]] = None
+        self.loop_thread = threading.main_thread().ident
+
+    def start(self) -> None:
+        if self.enabled and self.task is None:
+            self.loop_thread = threading.get_ident()
+            self.task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LOOP_MONITOR_INTERVAL
+            await asyncio.sleep(LOOP_MONITOR_INTERVAL)
+            self.record_lag(max(0.0, (loop.time() - expected) * 1000))
+
+    def record_lag(self, lag_ms: float) -> None:
+        bucket = next((i for i, bound in enumerate(LAG_BUCKETS_MS) if lag_ms < bound), len(LAG_BUCKETS_MS))
+        self.histogram[bucket] += 1
+        self.recent.append(lag_ms)
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        if lag_ms < LOOP_STALL_MS:
+            return
+        self.stalls += 1
+        cause = "unknown (not an instrumented section)"
+        if self.last_section is not None:
+            label, tool, ended_at, duration_ms = self.last_section
+            # The section must have ended during this stall to be its cause
+            if time.monotonic() - ended_at <= (lag_ms / 1000) + LOOP_MONITOR_INTERVAL:
+                cause = f"{label} ({duration_ms:.0f} ms, tool: {tool or 'none'})"
+        logger.warning("Event loop stalled for %.0f ms; likely cause: %s", lag_ms, cause)
+
+    @contextmanager
+    def blocking(self, label: str) -> Iterator[None]:
+        """Time a synchronous section that runs on the event loop."""
+        if threading.get_ident() != self.loop_thread:
+            # Offloaded to a worker thread: the loop is not held up
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if duration_ms >= SLOW_CALLBACK_MS:
+                tool = current_tool.get()
+                self.last_section = (label, tool, time.monotonic(), duration_ms)
+                stats = self.slow_sections.setdefault(label, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+                stats["count"] += 1
+                stats["total_ms"] += duration_ms
+                stats["max_ms"] = max(stats["max_ms"], duration_ms)
+                stats["last_tool"] = tool
+                logger.info("Slow section %s blocked the event loop for %.0f ms (tool: %s)", label, duration_ms, tool)
+
+    def status(self) -> dict[str, Any]:
+        labels = [f"<{bound}ms" for bound in LAG_BUCKETS_MS] + [f">={LAG_BUCKETS_MS[-1]}ms"]
+        recent = np.asarray(self.recent) if self.recent else np.zeros(1)
+        p50, p99 = np.percentile(recent, [50, 99])
+        return {
+            "enabled": self.task is not None,
+            "lag_p50_ms": round(float(p50), 1),
+            "lag_p99_ms": round(float(p99), 1),
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "stalls": self.stalls,
+            "histogram": dict(zip(labels, self.histogram))
+        }
+
+
+loop_monitor = LoopMonitor()
+
+
+# Worker Pool
+class WorkerPool:
+    """
+    Runs CPU-heavy render stages off the event loop.
+
+    Formatters given OFFLOAD_MIN_ITEMS or more tasks, fields or views run in
+    a thread pool. They are plain Python, so the interpreter switches back
+    to the loop every few milliseconds and other sessions keep being served
+    while a large page renders. Shorter payloads stay inline, where the hop
+    to a worker would cost more than it saves.
+
+    JSON decoding stays on the loop (timed by the loop monitor): json.loads
+    holds the interpreter lock for the whole parse, so a thread would not
+    free the loop, and a worker process would hand back a payload that costs
+    as much to unpickle as the JSON did to parse. Threads rather than
+    processes for rendering too, since formatters read process state
+    (member directory, field decoders, render cache). On a free-threaded
+    Python build the workers use separate cores. CLICKUP_OFFLOAD_WORKERS=0
+    keeps everything on the event loop.
+    """
+
+    def __init__(self, workers: int = OFFLOAD_WORKERS):
+        self.workers = workers
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.counts = {"inline": 0, "render_offloaded": 0}
+
+    def pool(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="clickup-worker")
+        return self.executor
+
+    async def render(self, func: Callable[..., str], payload: list, *args: Any, **kwargs: Any) -> str:
+        """Run a formatter over a list payload, in a worker thread when it is long."""
+        if self.workers <= 0 or len(payload) < OFFLOAD_MIN_ITEMS:
+            self.counts["inline"] += 1
+            return func(payload, *args, **kwargs)
+        self.counts["render_offloaded"] += 1
+        return await asyncio.get_running_loop().run_in_executor(
+            self.pool(), partial(func, payload, *args, **kwargs)
+        )
+
+    def status(self) -> dict[str, Any]:
+        return {"workers": self.workers, **self.counts}
+
+
+worker_pool = WorkerPool()
+
+
+# Tool Deadlines
+class DeadlineExceeded(TimeoutError):
+    """Raised when a tool call's deadline passes before a request completes."""
+
+
+# Event-loop time by which the current tool call must finish (None: no limit)
+tool_deadline: ContextVar[Optional[float]] = ContextVar("tool_deadline", default=None)
+
+
+def time_remaining() -> Optional[float]:
+    """Seconds left before the current tool call's deadline, or None."""
+    deadline = tool_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - asyncio.get_running_loop().time()
+
+
+def deadline_passed() -> bool:
+    """Whether the current tool call's deadline has already passed."""
+    remaining = time_remaining()
+    return remaining is not None and remaining <= 0
+
+
+def incomplete_notice() -> str:
+    """Banner for fan-out results cut short by the tool deadline."""
+    return (
+        "> ⚠️ **Incomplete results**: the tool deadline was reached before all "
+        "requests finished. Results below are partial.\n\n"
+    )
+
+
+def guarded_tool(deadline: float = TOOL_DEADLINE_SECONDS, admission: bool = True) -> Callable:
+    """
+    Run a tool call under a deadline that every upstream request inherits.
+
+    Calls first pass admission control: beyond TOOL_CONCURRENCY running
+    calls they queue (bounded by TOOL_QUEUE_SIZE and
+    TOOL_QUEUE_WAIT_SECONDS), and past that they are rejected at once with
+    a retry hint. The deadline starts once the call is admitted.
+
+    `make_api_request` cancels in-flight requests once the deadline passes,
+    so fan-out tools can still return partial results. The tool itself is
+    cancelled if it runs `TOOL_DEADLINE_GRACE` seconds past the deadline.
+    Client disconnects cancel the call the same way, since CancelledError
+    is never swallowed by the tools' `except Exception` handlers.
+    """
+    def decorator(func: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+        async def run(*args: Any, **kwargs: Any) -> str:
+            loop = asyncio.get_running_loop()
+            token = tool_deadline.set(loop.time() + deadline)
+            tool_token = current_tool.set(func.__name__)
+            try:
+                async with asyncio.timeout(deadline + TOOL_DEADLINE_GRACE):
+                    return await func(*args, **kwargs)
+            except TimeoutError:
+                return (
+                    f"Error: {func.__name__} did not finish within its {deadline:.0f}s "
+                    "deadline. Try a narrower request."
+                )
+            finally:
+                current_tool.reset(tool_token)
+                tool_deadline.reset(token)
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> str:
+            if cassette.mode == "record":
+                cassette.record_tool(func.__name__, args, kwargs)
+            if not admission:
+                return await run(*args, **kwargs)
+            try:
+                async with tool_limiter.slot():
+                    return await run(*args, **kwargs)
+            except OverloadedError as e:
+                return f"Error: {str(e)}"
+
+        return wrapper
+
+    return decorator
+
+
+prefetcher = Prefetcher(PREFETCH)
 
 
 # API Client Helper Functions
 def get_api_key() -> str:
     """Get ClickUp API key from environment variable."""
     api_key = os.getenv("CLICKUP_API_KEY")
+    if not api_key and cassette.mode == "replay":
+        return "[REDACTED]"
     if not api_key:
         raise ValueError(
             "CLICKUP_API_KEY environment variable is not set. "
@@ -35,27 +1066,93 @@ def get_api_key() -> str:
     return api_key
 
 
+async def send_request(
+    method: str,
+    url: str,
+    headers: dict,
+    params: Optional[dict] = None,
+    json_data: Optional[dict] = None,
+    template: str = ""
+) -> httpx.Response:
+    """
+    Send one HTTP request to ClickUp and return the raw response.
+
+    With CLICKUP_HEDGE_REQUESTS enabled, a GET that has not answered by the
+    endpoint template's recent p95 latency gets a second copy sent; the first
+    response wins and the other request is cancelled. Hedges need both a
+    free slot in the hedge budget and a spare rate-limit token.
+    """
+    hedge_budget.record_request()
+    threshold = None
+    if HEDGE_REQUESTS and method == "GET":
+        threshold = latency_tracker.percentile(template, HEDGE_PERCENTILE)
+
+    if threshold is None:
+        return await timed_send(method, url, headers, params, json_data, template)
+
+    started = time.monotonic()
+    primary = asyncio.ensure_future(timed_send(method, url, headers, params, json_data, template))
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=max(threshold, HEDGE_MIN_DELAY))
+        if done:
+            return primary.result()
+
+        reserve = rate_limiter.capacity * 0.1
+        if not hedge_budget.allow() or not rate_limiter.try_acquire(reserve=reserve):
+            return await primary
+
+        hedge = asyncio.ensure_future(timed_send(method, url, headers, params, json_data, template))
+        tasks.add(hedge)
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for finished in done:
+                if finished.exception() is None:
+                    if finished is hedge:
+                        hedge_budget.hedge_wins += 1
+                    return finished.result()
+        # Both copies failed: surface the primary's error
+        return primary.result()
+    finally:
+        if not primary.done():
+            # A primary beaten by its hedge took at least this long; recording
+            # it keeps the p95 from drifting down to only the fast winners
+            latency_tracker.record(template, time.monotonic() - started)
+        for task in (primary, *tasks):
+            if not task.done():
+                task.cancel()
+
+
 async def make_api_request(
     endpoint: str,
     method: str = "GET",
     params: Optional[dict] = None,
-    json_data: Optional[dict] = None
+    json_data: Optional[dict] = None,
+    prefetch: bool = False
 ) -> dict[str, Any]:
     """
     Make an authenticated request to the ClickUp API.
 
+    Hierarchy GETs are served from the response cache while fresh.
+
     Args:
         endpoint: API endpoint (e.g., '/team')
         method: HTTP method (GET, POST, etc.)
         params: Query parameters
         json_data: JSON body for POST/PUT requests
+        prefetch: Background request: only sent with spare rate-limit budget
 
     Returns:
         JSON response from the API
 
     Raises:
-        ValueError: For authentication or validation errors
-        httpx.HTTPStatusError: For other HTTP errors
+        RateLimitError: When ClickUp rejects the request with 429
+        CircuitOpenError: When recent requests of this kind keep failing
+        DeadlineExceeded: When the current tool call's deadline passes first
+        PrefetchSkipped: For prefetch requests when there is no spare budget
+        OverloadedError: When too many upstream requests are already queued
+        ResponseTooLargeError: When the body exceeds the endpoint's byte ceiling
+        ValueError: For authentication, validation and other HTTP errors
     """
     api_key = get_api_key()
     url = urljoin(API_BASE_URL + "/", endpoint.lstrip("/"))
@@ -65,745 +1162,3958 @@ async def make_api_request(
         "Content-Type": "application/json"
     }
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                json=json_data
-            )
-            response.raise_for_status()
-            return response.json()
-
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 401:
-                raise ValueError(
-                    "Authentication failed. Please check your CLICKUP_API_KEY. "
-                    "You can generate a new token at: "
-                    "https://app.clickup.com/settings/apps"
-                )
-            elif e.response.status_code == 404:
-                raise ValueError(
-                    f"Resource not found: {endpoint}. "
-                    "Please verify the ID is correct and you have access to this resource."
-                )
-            elif e.response.status_code == 403:
-                raise ValueError(
-                    f"Access denied to {endpoint}. "
-                    "Please check your permissions for this resource."
-                )
-            elif e.response.status_code == 429:
-                raise ValueError(
-                    "Rate limit exceeded. Please wait a moment and try again. "
-                    "ClickUp API has rate limits to protect service quality."
-                )
+    template = endpoint_template(endpoint)
+    breaker = get_circuit_breaker(template)
+
+    cache_ttl = cache_ttl_for(endpoint, params) if method == "GET" else None
+    key = cache_key(endpoint, params)
+    if cache_ttl is not None:
+        cached = response_cache.get(key, cache_ttl)
+        if cached is not None:
+            response_cache.hits += 1
+            return cached
+        response_cache.misses += 1
+
+    # Fail fast before spending rate-limit budget on a failing endpoint class
+    try:
+        breaker.before_request()
+    except CircuitOpenError:
+        stale = response_cache.get(key, CACHE_STALE_SECONDS) if cache_ttl is not None else None
+        if stale is None:
+            raise
+        response_cache.stale_served += 1
+        return stale
+
+    sent_at = None
+    recorded = False
+    try:
+        if prefetch and upstream_limiter.busy():
+            raise PrefetchSkipped(endpoint)
+        async with asyncio.timeout_at(tool_deadline.get()), upstream_limiter.slot():
+            if prefetch:
+                if not rate_limiter.try_acquire(reserve=rate_limiter.capacity * PREFETCH_RESERVE):
+                    raise PrefetchSkipped(endpoint)
+            elif background_request.get():
+                await rate_limiter.acquire_spare(rate_limiter.capacity * WARMUP_RESERVE)
             else:
-                raise ValueError(
-                    f"ClickUp API error ({e.response.status_code}): {e.response.text}"
+                await rate_limiter.acquire()
+            sent_at = time.monotonic()
+            try:
+                response = await send_request(
+                    method, url, headers, params, json_data, template=template
                 )
+            except (httpx.TimeoutException, httpx.TransportError):
+                breaker.record(ok=False)
+                recorded = True
+                raise
+            breaker.record(ok=response.status_code < 500)
+            recorded = True
+    except TimeoutError:
+        raise DeadlineExceeded(
+            f"Deadline reached before {endpoint} finished. "
+            "The request was cancelled; try a narrower query."
+        )
+    finally:
+        if not recorded:
+            # Cancelled (deadline or client disconnect): only a long wait on
+            # ClickUp itself counts against the endpoint
+            if sent_at is not None and time.monotonic() - sent_at >= BREAKER_SLOW_SECONDS:
+                breaker.record(ok=False)
+            else:
+                breaker.release()
 
+    try:
+        response.raise_for_status()
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 401:
+            raise ValueError(
+                "Authentication failed. Please check your CLICKUP_API_KEY. "
+                "You can generate a new token at: "
+                "https://app.clickup.com/settings/apps"
+            )
+        elif e.response.status_code == 404:
+            raise ValueError(
+                f"Resource not found: {endpoint}. "
+                "Please verify the ID is correct and you have access to this resource."
+            )
+        elif e.response.status_code == 403:
+            raise ValueError(
+                f"Access denied to {endpoint}. "
+                "Please check your permissions for this resource."
+            )
+        elif e.response.status_code == 429:
+            retry_after = retry_after_seconds(e.response)
+            rate_limiter.pause(retry_after)
+            raise RateLimitError(
+                "Rate limit exceeded. Please wait a moment and try again. "
+                "ClickUp API has rate limits to protect service quality.",
+                retry_after=retry_after
+            )
+        else:
+            raise UpstreamError(
+                f"ClickUp API error ({e.response.status_code}): {e.response.text}",
+                status_code=e.response.status_code
+            )
 
-def truncate_if_needed(text: str, limit: int = CHARACTER_LIMIT) -> str:
-    """Truncate text if it exceeds the character limit."""
-    if len(text) <= limit:
-        return text
-    return text[:limit] + f"\n\n... (truncated, {len(text) - limit} characters omitted)"
+    with loop_monitor.blocking(f"json decode {template}"):
+        data = response.json()
+    if cache_ttl is not None:
+        response_cache.put(key, data)
+    elif method != "GET":
+        response_cache.invalidate_tasks()
+    return data
 
 
-def format_spaces_response(spaces: list[dict]) -> str:
-    """Format spaces data into a readable markdown response."""
-    if not spaces:
-        return "No spaces found in this workspace."
+async def gather_with_concurrency(
+    aws: Iterable[Awaitable[Any]],
+    limit: int = MAX_CONCURRENT_REQUESTS
+) -> list[Any]:
+    """
+    Await many requests concurrently with at most `limit` in flight.
 
-    output = f"# Spaces ({len(spaces)} total)\n\n"
+    Results come back in input order. A failed awaitable yields its exception
+    in place of a result, so one bad list does not sink a whole fan-out.
+    """
+    semaphore = asyncio.Semaphore(limit)
 
-    for space in spaces:
-        output += f"## {space.get('name', 'Unnamed Space')}\n"
-        output += f"- **ID**: `{space.get('id')}`\n"
-        output += f"- **Private**: {space.get('private', False)}\n"
-        output += f"- **Archived**: {space.get('archived', False)}\n"
+    async def run(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
 
-        if 'statuses' in space:
-            statuses = space['statuses']
-            output += f"- **Statuses**: {len(statuses)} status(es)\n"
+    return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=True)
 
-        if 'features' in space:
-            features = space['features']
-            due_dates = features.get('due_dates', {})
-            output += f"- **Due Dates Enabled**: {due_dates.get('enabled', False)}\n"
 
-        output += "\n"
+async def iter_task_pages(
+    endpoint: str,
+    params: Optional[dict] = None,
+    max_pages: Optional[int] = None,
+    concurrency: int = PAGE_CONCURRENCY,
+    start_page: int = 0,
+    page_size: int = TASK_PAGE_SIZE
+) -> AsyncIterator[list[dict]]:
+    """
+    Stream pages of tasks from a paginated ClickUp task endpoint.
 
-    return truncate_if_needed(output)
+    Pages are fetched in concurrent waves of `concurrency` requests and
+    yielded in order. Iteration stops at the last page, at `max_pages`, or
+    as soon as the caller stops consuming the iterator.
 
+    Args:
+        endpoint: Task endpoint (e.g., '/list/123/task' or '/team/456/task')
+        params: Query parameters shared by every page request
+        max_pages: Maximum number of pages to fetch (None for all)
+        concurrency: Number of pages requested per wave
+        start_page: First page to fetch
+        page_size: Tasks in a full page, for responses without `last_page`
+    """
+    page = start_page
+    while max_pages is None or page - start_page < max_pages:
+        wave = concurrency if max_pages is None else min(concurrency, max_pages - (page - start_page))
+        responses = await asyncio.gather(*(
+            make_api_request(endpoint, params={**(params or {}), "page": page + offset})
+            for offset in range(wave)
+        ))
+
+        for data in responses:
+            tasks = data.get("tasks", [])
+            if tasks:
+                yield tasks
+            if data.get("last_page", len(tasks) < page_size):
+                return
+
+        page += wave
+
+
+def prefetch_list_details(lists: list[dict]) -> None:
+    """Warm list details and custom fields for lists just shown to the client."""
+    prefetcher.schedule(
+        request
+        for lst in lists
+        for request in ((f"/list/{lst.get('id')}", None), (f"/list/{lst.get('id')}/field", None))
+    )
+
+
+async def get_space_lists(space_id: str, archived: bool = False) -> list[dict]:
+    """
+    Get every list in a space, both inside folders and folderless.
 
-def format_space_details(space: dict) -> str:
-    """Format detailed space information into markdown."""
-    output = f"# Space: {space.get('name', 'Unnamed')}\n\n"
-    output += f"**ID**: `{space.get('id')}`\n"
-    output += f"**Private**: {space.get('private', False)}\n"
-    output += f"**Archived**: {space.get('archived', False)}\n\n"
+    Folder lists are annotated with a `folder` entry so callers can show
+    where each list lives.
+    """
+    params = {"archived": str(archived).lower()}
+    folders_data, lists_data = await asyncio.gather(
+        make_api_request(f"/space/{space_id}/folder", params=params),
+        make_api_request(f"/space/{space_id}/list", params=params)
+    )
+
+    lists = []
+    for folder in folders_data.get("folders", []):
+        for lst in folder.get("lists", []):
+            lists.append({
+                **lst,
+                "folder": {"id": folder.get("id"), "name": folder.get("name")}
+            })
+    lists.extend(lists_data.get("lists", []))
+    return lists
+
+
+async def crawl_views(
+    space_id: str,
+    team_id: Optional[str] = None,
+    include_nested: bool = True
+) -> tuple[list[dict], dict[str, int], list[Exception]]:
+    """
+    Collect views from every hierarchy level of a space.
+
+    The workspace (if team_id is given), space, folder and list view
+    endpoints are fetched concurrently and views are deduplicated by ID.
+    Returns (views, endpoints queried per level, failures).
+    """
+    endpoints = [("space", f"/space/{space_id}/view")]
+    if team_id:
+        endpoints.append(("workspace", f"/team/{team_id}/view"))
+    if include_nested:
+        folders_data, lists = await asyncio.gather(
+            make_api_request(f"/space/{space_id}/folder", params={"archived": "false"}),
+            get_space_lists(space_id)
+        )
+        endpoints += [("folder", f"/folder/{f.get('id')}/view") for f in folders_data.get("folders", [])]
+        endpoints += [("list", f"/list/{lst.get('id')}/view") for lst in lists]
+
+    results = await gather_with_concurrency(make_api_request(endpoint) for _, endpoint in endpoints)
+
+    views: dict[str, dict] = {}
+    levels: dict[str, int] = {}
+    failures = []
+    for (level, _), result in zip(endpoints, results):
+        levels[level] = levels.get(level, 0) + 1
+        if isinstance(result, BaseException):
+            failures.append(result)
+            continue
+        for view in result.get("views", []):
+            views.setdefault(view.get("id"), view)
+    return list(views.values()), levels, failures
+
+
+async def run_bulk_operations(
+    items: list[str],
+    operation: Any,
+    concurrency: int = BULK_CONCURRENCY,
+    max_attempts: int = BULK_MAX_ATTEMPTS,
+    idempotent: bool = True
+) -> dict[str, Optional[str]]:
+    """
+    Run `operation(item)` for every item with bounded concurrency.
+
+    Requests go through the shared rate limiter; a 429 is retried after the
+    wait ClickUp asks for, other errors are retried with jittered backoff only
+    when they look transient (5xx, timeouts). Every item gets a result, so one
+    failure never hides the outcome of the rest.
+
+    Set `idempotent=False` for creates: only 429s are retried then, since a
+    timed-out create may still have succeeded upstream.
+
+    Returns:
+        Mapping of item to None on success or an error message on failure
+    """
+    async def run(item: str) -> Optional[str]:
+        for attempt in range(1, max_attempts + 1):
+            try:
+                await operation(item)
+                return None
+            except RateLimitError as e:
+                if attempt == max_attempts:
+                    return str(e)
+                await asyncio.sleep(e.retry_after + random.uniform(0, 1))
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                if attempt == max_attempts or not idempotent:
+                    return f"Network error: {e}"
+                await asyncio.sleep(2 ** attempt + random.uniform(0, 1))
+            except ValueError as e:
+                transient = isinstance(e, UpstreamError) and e.status_code >= 500
+                if attempt == max_attempts or not idempotent or not transient:
+                    return str(e)
+                await asyncio.sleep(2 ** attempt + random.uniform(0, 1))
+        return "Gave up after retries"
+
+    results = await gather_with_concurrency((run(item) for item in items), limit=concurrency)
+    return {
+        item: str(result) if isinstance(result, BaseException) else result
+        for item, result in zip(items, results)
+    }
+
+
+# Member Directory
+class MemberDirectory:
+    """
+    Workspace members by user ID, for resolving users in task payloads.
+
+    Loaded from GET /team (one call covers every workspace the API key can
+    see) and refreshed after MEMBER_CACHE_TTL_SECONDS. A failed load is
+    not retried for MEMBER_RETRY_SECONDS, so an outage does not add a /team
+    request to every tool call. Tools call `ensure` before formatting;
+    formatters then resolve names without API calls and fall back to
+    whatever the payload carries when a user is unknown.
+    """
+
+    def __init__(self, ttl: float = MEMBER_CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self.members: dict[str, dict[str, Optional[str]]] = {}
+        self.loaded_at: Optional[float] = None
+        self.failed_at: Optional[float] = None
+        self.lock = asyncio.Lock()
+
+    def fresh(self) -> bool:
+        now = time.monotonic()
+        if self.failed_at is not None and now - self.failed_at < MEMBER_RETRY_SECONDS:
+            return True
+        return self.loaded_at is not None and now - self.loaded_at < self.ttl
+
+    async def ensure(self) -> None:
+        """Load or refresh the directory; failures leave the previous one in place."""
+        if self.fresh():
+            return
+        async with self.lock:
+            if self.fresh():
+                return
+            try:
+                data = await make_api_request("/team")
+            except Exception:
+                self.failed_at = time.monotonic()
+                return
+            self.failed_at = None
+            members = {}
+            for team in data.get("teams", []):
+                for member in team.get("members", []):
+                    user = member.get("user") or {}
+                    members[str(user.get("id"))] = {
+                        "name": user.get("username") or user.get("email"),
+                        "email": user.get("email")
+                    }
+            self.members = members
+            self.loaded_at = time.monotonic()
+
+    def name(self, user: Any) -> str:
+        """Display name for a user object or bare user ID."""
+        if isinstance(user, dict):
+            user_id, fallback = user.get("id"), user.get("username") or user.get("email")
+        else:
+            user_id, fallback = user, None
+        member = self.members.get(str(user_id))
+        return (member and member["name"]) or fallback or f"User {user_id}"
+
+    def email(self, user: Any) -> Optional[str]:
+        """Email address for a user object or bare user ID, if known."""
+        user_id = user.get("id") if isinstance(user, dict) else user
+        member = self.members.get(str(user_id))
+        return (member and member["email"]) or (user.get("email") if isinstance(user, dict) else None)
+
+    def names(self, users: Iterable[Any]) -> str:
+        return ", ".join(self.name(user) for user in users)
+
+
+member_directory = MemberDirectory()
+
+
+# Rendered Output Cache
+class RenderCache:
+    """
+    LRU cache of rendered markdown, bounded by total cached characters and
+    by entry count.
+
+    Keys combine the formatter name, its options, and the identity of the
+    upstream payload. Each entry keeps its payload alive, so an identity
+    cannot be reused by another object while the entry exists.
+    """
+
+    def __init__(self, max_chars: int, max_entries: int):
+        self.max_chars = max_chars
+        self.max_entries = max_entries
+        self.entries: OrderedDict[tuple, tuple[Any, str]] = OrderedDict()
+        self.chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()  # formatters also run in worker threads
+
+    def get(self, key: tuple) -> Optional[str]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: tuple, payload: Any, value: str) -> None:
+        if len(value) > self.max_chars:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.chars -= len(self.entries.pop(key)[1])
+            self.entries[key] = (payload, value)
+            self.chars += len(value)
+            while self.chars > self.max_chars or len(self.entries) > self.max_entries:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.chars -= len(evicted)
+
+
+render_cache = RenderCache(RENDER_CACHE_MAX_CHARS, CACHE_MAX_ENTRIES)
+
+
+def payload_hash(payload: Any) -> str:
+    """Content hash of an upstream JSON payload."""
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+
+def payload_identity(payload: Any) -> tuple:
+    """
+    Identity of an upstream payload: the object itself, or each item of a
+    list, since tools often regroup cached objects into new lists.
+
+    Cached responses are shared and read-only, so the same objects mean the
+    same content until the response cache refetches them.
+    """
+    if isinstance(payload, list):
+        return tuple(map(id, payload))
+    return (id(payload),)
+
+
+def memoize_render(func: Callable[..., str]) -> Callable[..., str]:
+    """
+    Cache a formatter's output keyed by (formatter, options, payload identity).
+
+    The first positional argument is the upstream payload; any further
+    arguments are formatting options and become part of the key. Hashing
+    the payload's content cost more than rendering it, so repeated calls
+    only hit while the response cache returns the same objects.
+    """
+    @wraps(func)
+    def wrapper(payload: Any, *args: Any, **kwargs: Any) -> str:
+        with loop_monitor.blocking(func.__name__):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())), payload_identity(payload))
+            cached = render_cache.get(key)
+            if cached is not None:
+                return cached
+            rendered = func(payload, *args, **kwargs)
+            render_cache.put(key, payload, rendered)
+            return rendered
+
+    return wrapper
+
+
+# Custom Field Decoders
+def shorten(text: str, limit: int = FIELD_VALUE_MAX_CHARS) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def format_field_date(value: Any) -> str:
+    """ClickUp date value (ms) as YYYY-MM-DD, with the time when it is set."""
+    moment = datetime.fromtimestamp(int(value) / 1000, tz=timezone.utc)
+    if moment.hour or moment.minute:
+        return moment.strftime("%Y-%m-%d %H:%M UTC")
+    return moment.strftime("%Y-%m-%d")
+
+
+def build_field_decoder(field: dict) -> Callable[[Any], str]:
+    """
+    Build a value formatter for one custom field definition.
+
+    Option tables (dropdown and label IDs to names) are built here once, so
+    decoding a task's value is a dictionary lookup.
+    """
+    field_type = field.get("type")
+    config = field.get("type_config") or {}
+
+    if field_type == "drop_down":
+        names = {}
+        for option in config.get("options", []):
+            names[option.get("id")] = names[option.get("orderindex")] = option.get("name")
+            names[str(option.get("orderindex"))] = option.get("name")
+        return lambda value: str(names.get(value, value))
+
+    if field_type == "labels":
+        labels = {option.get("id"): option.get("label") or option.get("name") for option in config.get("options", [])}
+        return lambda value: ", ".join(str(labels.get(label_id, label_id)) for label_id in value)
+
+    if field_type == "currency":
+        currency = config.get("currency_type", "")
+        return lambda value: f"{float(value):,.2f} {currency}".strip()
+
+    if field_type == "date":
+        return format_field_date
+
+    if field_type in ("emoji", "rating"):
+        count = config.get("count", 5)
+        return lambda value: f"{value}/{count}"
+
+    if field_type == "location":
+        return lambda value: shorten(value.get("formatted_address") or value.get("location") or value)
+
+    if field_type == "users":
+        return lambda value: member_directory.names(value)
+
+    if field_type == "checkbox":
+        return lambda value: "Yes" if str(value).lower() == "true" else "No"
+
+    if field_type in ("manual_progress", "automatic_progress"):
+        return lambda value: f"{value.get('percent_completed', 0)}%" if isinstance(value, dict) else f"{value}%"
+
+    if field_type in ("tasks", "list_relationship"):
+        return lambda value: ", ".join(shorten(item.get("name") or item.get("id"), 40) for item in value)
+
+    if field_type == "attachment":
+        return lambda value: f"{len(value)} file(s)"
+
+    def decode(value: Any) -> str:
+        if isinstance(value, list):
+            return f"[{len(value)} items]"
+        if isinstance(value, dict):
+            return shorten(json.dumps(value, default=str))
+        return shorten(value)
+
+    return decode
+
+
+class FieldDecoderIndex:
+    """
+    Prebuilt custom field decoders keyed by field ID.
+
+    `load` registers a list's definitions from `/list/{id}/field` and skips
+    the rebuild when the definitions have not changed; fields only seen in
+    task payloads get a decoder built from their embedded type_config on
+    first use.
+    """
+
+    def __init__(self, max_fields: int = FIELD_DECODER_MAX):
+        self.max_fields = max_fields
+        self.decoders: OrderedDict[str, Callable[[Any], str]] = OrderedDict()
+        self.list_hashes: dict[str, str] = {}
+        self.lock = threading.Lock()  # decode() also runs in worker threads
+
+    def register(self, field: dict) -> Callable[[Any], str]:
+        decoder = build_field_decoder(field)
+        with self.lock:
+            self.decoders[field.get("id")] = decoder
+            self.decoders.move_to_end(field.get("id"))
+            while len(self.decoders) > self.max_fields:
+                self.decoders.popitem(last=False)
+        return decoder
+
+    def load(self, list_id: str, fields: list[dict]) -> None:
+        definitions_hash = payload_hash(fields)
+        if self.list_hashes.get(list_id) == definitions_hash:
+            return
+        for field in fields:
+            self.register(field)
+        self.list_hashes[list_id] = definitions_hash
+
+    def decode(self, field: dict) -> Optional[str]:
+        """Readable value of a task's custom field, or None when it is empty."""
+        value = field.get("value")
+        if value is None or value == "" or value == []:
+            return None
+        decoder = self.decoders.get(field.get("id")) or self.register(field)
+        try:
+            return decoder(value)
+        except (TypeError, ValueError, AttributeError):
+            return shorten(value)
+
+
+field_decoders = FieldDecoderIndex()
+
+
+def truncate_if_needed(text: str, limit: int = CHARACTER_LIMIT) -> str:
+    """Truncate text if it exceeds the character limit."""
+    if len(text) <= limit:
+        return text
+    return text[:limit] + f"\n\n... (truncated, {len(text) - limit} characters omitted)"
+
+
+def parse_date_ms(value: Optional[str]) -> Optional[int]:
+    """
+    Convert a date argument to a ClickUp timestamp in milliseconds.
+
+    Accepts Unix milliseconds ("1735689600000") or an ISO date/datetime
+    ("2025-01-01", "2025-01-01T09:30:00"). Naive values are read as UTC.
+    """
+    if value is None or value == "":
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(
+            f"Invalid date '{value}'. Use YYYY-MM-DD, an ISO datetime, "
+            "or Unix milliseconds."
+        )
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+def task_filter_params(
+    statuses: Optional[list[str]] = None,
+    assignees: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+    space_ids: Optional[list[str]] = None,
+    list_ids: Optional[list[str]] = None
+) -> dict[str, list[str]]:
+    """Array filters for the filtered team task endpoint."""
+    params = {}
+    for key, values in (
+        ("statuses[]", statuses),
+        ("assignees[]", assignees),
+        ("tags[]", tags),
+        ("space_ids[]", space_ids),
+        ("list_ids[]", list_ids)
+    ):
+        if values:
+            params[key] = values
+    return params
+
+
+def format_minutes(minutes: float) -> str:
+    """Human-readable duration, e.g. 45m, 6.5h, 3.2d."""
+    if minutes < 60:
+        return f"{minutes:.0f}m"
+    if minutes < 24 * 60:
+        return f"{minutes / 60:.1f}h"
+    return f"{minutes / (24 * 60):.1f}d"
+
+
+def format_task(task: dict, index: int, show_list: bool = False) -> str:
+    """Format a single task with its key properties and custom field values."""
+    task_name = task.get('name', 'Unnamed Task')
+    task_id = task.get('id')
+    status = task.get('status', {}).get('status', 'No Status')
+
+    output = f"## {index}. {task_name}\n"
+    output += f"- **Task ID**: `{task_id}`\n"
+    output += f"- **Status**: {status}\n"
+    output += f"- **Created**: {task.get('date_created', 'N/A')}\n"
+    if task.get('creator'):
+        output += f"- **Creator**: {member_directory.name(task['creator'])}\n"
+
+    # Parent (for subtasks)
+    if task.get('parent'):
+        output += f"- **Parent Task**: `{task['parent']}`\n"
+
+    # Location (for cross-list results)
+    if show_list and task.get('list'):
+        lst = task['list']
+        output += f"- **List**: {lst.get('name', 'N/A')} (ID: `{lst.get('id')}`)\n"
+
+    # Priority
+    if 'priority' in task and task['priority']:
+        priority = task['priority']
+        output += f"- **Priority**: {priority.get('priority', 'N/A')}\n"
+
+    # Due date
+    if 'due_date' in task and task['due_date']:
+        output += f"- **Due Date**: {task['due_date']}\n"
+
+    # Assignees
+    assignees = task.get('assignees', [])
+    if assignees:
+        output += f"- **Assignees**: {member_directory.names(assignees)}\n"
+
+    # Watchers
+    watchers = task.get('watchers', [])
+    if watchers:
+        output += f"- **Watchers**: {member_directory.names(watchers[:10])}"
+        output += f" (+{len(watchers) - 10} more)\n" if len(watchers) > 10 else "\n"
+
+    # Custom fields with values, decoded in one pass
+    filled = []
+    for field in task.get('custom_fields', []):
+        value = field_decoders.decode(field)
+        if value is not None:
+            filled.append((field.get('name', 'Unknown'), value))
+    if filled:
+        output += "- **Custom Fields**:\n"
+        for field_name, value in filled[:5]:  # Limit to 5 fields per task
+            output += f"  - {field_name}: {value}\n"
+        if len(filled) > 5:
+            output += f"  - *{len(filled) - 5} more filled fields*\n"
+
+    # Description preview
+    if 'description' in task and task['description']:
+        desc = task['description'][:100].replace('\n', ' ')
+        output += f"- **Description**: {desc}...\n"
+
+    return output + "\n"
+
+
+def build_task_tree(tasks: Iterable[dict]) -> tuple[dict[str, dict], dict[Optional[str], list[str]]]:
+    """
+    Index tasks by id and group child ids under their parent in one pass.
+
+    Returns (index, children), where children[None] holds top-level tasks.
+    Subtasks whose parent was not fetched are promoted to the top level
+    when rendering.
+    """
+    index: dict[str, dict] = {}
+    children: dict[Optional[str], list[str]] = {}
+    for task in tasks:
+        task_id = task.get("id")
+        index[task_id] = task
+        children.setdefault(task.get("parent"), []).append(task_id)
+    return index, children
+
+
+def count_descendants(task_id: str, children: dict[Optional[str], list[str]]) -> int:
+    """Number of tasks below task_id in the tree."""
+    total, stack = 0, list(children.get(task_id, []))
+    while stack:
+        child = stack.pop()
+        total += 1
+        stack.extend(children.get(child, []))
+    return total
+
+
+def render_task_tree(
+    roots: list[str],
+    index: dict[str, dict],
+    children: dict[Optional[str], list[str]],
+    max_depth: int,
+    max_nodes: int
+) -> tuple[str, int]:
+    """
+    Render task subtrees as an indented Markdown list.
+
+    Walks depth-first without recursion. Branches deeper than max_depth are
+    summarized as a subtask count, and rendering stops after max_nodes
+    tasks. Returns (markdown, rendered_count).
+    """
+    output = ""
+    rendered = 0
+    stack = [(task_id, 0) for task_id in reversed(roots)]
+    while stack and rendered < max_nodes:
+        task_id, depth = stack.pop()
+        task = index[task_id]
+        status = task.get('status', {}).get('status', 'No Status')
+        assignees = member_directory.names(task.get('assignees', [])[:3])
+
+        output += f"{'  ' * depth}- **{task.get('name', 'Unnamed Task')}** `{task_id}` — {status}"
+        output += f" ({assignees})" if assignees else ""
+
+        child_ids = children.get(task_id, [])
+        if child_ids and depth + 1 >= max_depth:
+            output += f" — *{count_descendants(task_id, children)} subtasks not shown*"
+        else:
+            stack.extend((child_id, depth + 1) for child_id in reversed(child_ids))
+        output += "\n"
+        rendered += 1
+    return output, rendered
+
+
+def render_tasks(tasks: list[dict], show_list: bool = False) -> str:
+    """Format a page of tasks, timed as one section on the event loop."""
+    with loop_monitor.blocking("format_task page"):
+        return "".join(format_task(task, i, show_list) for i, task in enumerate(tasks, 1))
+
+
+def format_spaces_response(spaces: list[dict]) -> str:
+    """Format spaces data into a readable markdown response."""
+    if not spaces:
+        return "No spaces found in this workspace."
+
+    output = f"# Spaces ({len(spaces)} total)\n\n"
+
+    for space in spaces:
+        output += f"## {space.get('name', 'Unnamed Space')}\n"
+        output += f"- **ID**: `{space.get('id')}`\n"
+        output += f"- **Private**: {space.get('private', False)}\n"
+        output += f"- **Archived**: {space.get('archived', False)}\n"
+
+        if 'statuses' in space:
+            statuses = space['statuses']
+            output += f"- **Statuses**: {len(statuses)} status(es)\n"
+
+        if 'features' in space:
+            features = space['features']
+            due_dates = features.get('due_dates', {})
+            output += f"- **Due Dates Enabled**: {due_dates.get('enabled', False)}\n"
+
+        output += "\n"
+
+    return truncate_if_needed(output)
+
+
+@memoize_render
+def format_space_details(space: dict) -> str:
+    """Format detailed space information into markdown."""
+    output = f"# Space: {space.get('name', 'Unnamed')}\n\n"
+    output += f"**ID**: `{space.get('id')}`\n"
+    output += f"**Private**: {space.get('private', False)}\n"
+    output += f"**Archived**: {space.get('archived', False)}\n\n"
+
+    # Statuses
+    if 'statuses' in space:
+        output += "## Statuses\n\n"
+        for status in space['statuses']:
+            status_name = status.get('status', 'Unknown')
+            status_type = status.get('type', '')
+            color = status.get('color', '')
+            output += f"- **{status_name}** (Type: {status_type}, Color: {color})\n"
+        output += "\n"
+
+    # Folders
+    if 'folders' in space:
+        folders = space['folders']
+        output += f"## Folders ({len(folders)} total)\n\n"
+        for folder in folders:
+            output += f"### {folder.get('name', 'Unnamed Folder')}\n"
+            output += f"- **ID**: `{folder.get('id')}`\n"
+            output += f"- **Hidden**: {folder.get('hidden', False)}\n"
+
+            if 'lists' in folder:
+                lists = folder['lists']
+                output += f"- **Lists**: {len(lists)}\n"
+                for lst in lists:
+                    output += f"  - {lst.get('name')} (ID: `{lst.get('id')}`)\n"
+            output += "\n"
+
+    # Lists (folderless)
+    if 'lists' in space:
+        lists = space['lists']
+        output += f"## Lists ({len(lists)} folderless)\n\n"
+        for lst in lists:
+            output += f"- **{lst.get('name', 'Unnamed List')}** (ID: `{lst.get('id')}`)\n"
+
+    return truncate_if_needed(output)
+
+
+@memoize_render
+def format_custom_fields(fields: list[dict]) -> str:
+    """Format custom fields into readable markdown."""
+    if not fields:
+        return "No custom fields found for this list."
+
+    output = f"# Custom Fields ({len(fields)} total)\n\n"
+
+    for field in fields:
+        output += f"## {field.get('name', 'Unnamed Field')}\n"
+        output += f"- **ID**: `{field.get('id')}`\n"
+        output += f"- **Type**: {field.get('type', 'unknown')}\n"
+        output += f"- **Required**: {field.get('required', False)}\n"
+        output += f"- **Hidden from guests**: {field.get('hide_from_guests', False)}\n"
+
+        # Type-specific configuration
+        type_config = field.get('type_config', {})
+        if type_config:
+            output += "- **Configuration**:\n"
+            for key, value in type_config.items():
+                output += f"  - {key}: {value}\n"
+
+        output += "\n"
+
+    return truncate_if_needed(output)
+
+
+@memoize_render
+def format_views(views: list[dict]) -> str:
+    """Format views grouped by type into readable markdown."""
+    output = f"# Views ({len(views)} total)\n\n"
+
+    # Group by type
+    view_types = {}
+    for view in views:
+        view_type = view.get('type', 'unknown')
+        if view_type not in view_types:
+            view_types[view_type] = []
+        view_types[view_type].append(view)
+
+    for view_type, type_views in view_types.items():
+        output += f"## {view_type.title()} Views ({len(type_views)})\n\n"
+
+        for view in type_views:
+            view_name = view.get('name', 'Unnamed View')
+            view_id = view.get('id')
+
+            output += f"### {view_name}\n"
+            output += f"- **View ID**: `{view_id}`\n"
+            output += f"- **Type**: {view_type}\n"
+
+            # Protected/private
+            if 'protected' in view:
+                output += f"- **Protected**: {view.get('protected', False)}\n"
+
+            # Parent info
+            if 'parent' in view:
+                parent = view['parent']
+                output += f"- **Parent**: {parent.get('name', 'N/A')} (ID: {parent.get('id')})\n"
+
+            # Settings preview
+            if 'settings' in view and view['settings']:
+                output += f"- **Configured**: Yes\n"
+
+            output += "\n"
+
+    return truncate_if_needed(output)
+
+
+def strip_ids(value: Any) -> Any:
+    """Recursively drop `id` keys so equivalent configurations compare equal."""
+    if isinstance(value, dict):
+        return {k: strip_ids(v) for k, v in value.items() if k != "id"}
+    if isinstance(value, list):
+        return [strip_ids(v) for v in value]
+    return value
+
+
+def field_config_hash(field: dict) -> str:
+    """
+    Hash a custom field's type and configuration, ignoring IDs.
+
+    Two fields with the same hash accept the same values (e.g. dropdowns
+    with identical options), even if they were created separately.
+    """
+    config = {
+        "type": field.get("type"),
+        "type_config": strip_ids(field.get("type_config") or {})
+    }
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+
+def normalize_field_name(name: str) -> str:
+    """Normalize a field name for near-duplicate detection."""
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def format_index_ranges(indices: list[int], prefix: str = "L") -> str:
+    """Compress sorted 1-based indices into ranges, e.g. L1-L3, L7."""
+    ranges = []
+    start = prev = None
+    for index in indices:
+        if start is None:
+            start = prev = index
+        elif index == prev + 1:
+            prev = index
+        else:
+            ranges.append((start, prev))
+            start = prev = index
+    if start is not None:
+        ranges.append((start, prev))
+
+    return ", ".join(
+        f"{prefix}{a}" if a == b else f"{prefix}{a}-{prefix}{b}"
+        for a, b in ranges
+    )
+
+
+def format_custom_field_audit(
+    space_id: str,
+    lists: list[dict],
+    list_fields: list[Any]
+) -> str:
+    """
+    Format a space-wide custom field audit into markdown.
+
+    Field definitions are deduplicated by ID, so output grows with the number
+    of distinct fields rather than lists x fields. Coverage is shown as ranges
+    of list indices from the legend.
+    """
+    distinct: dict[str, dict] = {}
+    coverage: dict[str, list[int]] = {}
+    failed = []
+    instances = 0
+
+    for index, (lst, fields) in enumerate(zip(lists, list_fields), 1):
+        if isinstance(fields, BaseException):
+            failed.append((index, lst, fields))
+            continue
+        for field in fields:
+            field_id = field.get("id")
+            instances += 1
+            if field_id not in distinct:
+                distinct[field_id] = field
+                coverage[field_id] = []
+            coverage[field_id].append(index)
+
+    scanned = len(lists) - len(failed)
+    hashes = {field_id: field_config_hash(field) for field_id, field in distinct.items()}
+
+    output = f"# Custom Field Audit: Space `{space_id}`\n\n"
+    output += f"**Lists scanned**: {scanned}"
+    if failed:
+        output += f" ({len(failed)} failed)"
+    output += "\n"
+    output += f"**Field instances**: {instances}\n"
+    output += f"**Distinct fields**: {len(distinct)} by ID, "
+    output += f"{len(set(hashes.values()))} distinct configurations\n\n"
+
+    # Legend
+    output += "## Lists\n\n"
+    for index, lst in enumerate(lists, 1):
+        folder = lst.get("folder") or {}
+        location = f" — {folder.get('name')}" if folder.get("name") else ""
+        output += f"- L{index}: {lst.get('name', 'Unnamed List')} (ID: `{lst.get('id')}`){location}\n"
+    output += "\n"
+
+    # Coverage matrix, one row per distinct field
+    output += f"## Fields ({len(distinct)} distinct)\n\n"
+    for field_id, field in sorted(
+        distinct.items(),
+        key=lambda item: (-len(coverage[item[0]]), item[1].get("name", ""))
+    ):
+        covered = coverage[field_id]
+        if len(covered) == scanned:
+            where = f"all {scanned} lists"
+        else:
+            where = f"{len(covered)}/{scanned} lists: {format_index_ranges(covered)}"
+
+        output += f"### {field.get('name', 'Unnamed Field')}\n"
+        output += f"- **ID**: `{field_id}`\n"
+        output += f"- **Type**: {field.get('type', 'unknown')}\n"
+        output += f"- **Config hash**: `{hashes[field_id]}`\n"
+        output += f"- **Coverage**: {where}\n\n"
+
+    # Near duplicates: same normalized name or same non-trivial configuration
+    by_name: dict[str, list[str]] = {}
+    by_config: dict[str, list[str]] = {}
+    for field_id, field in distinct.items():
+        by_name.setdefault(normalize_field_name(field.get("name", "")), []).append(field_id)
+        if field.get("type_config"):
+            by_config.setdefault(hashes[field_id], []).append(field_id)
+
+    def describe(field_ids: list[str]) -> str:
+        return ", ".join(
+            f"**{distinct[field_id].get('name', 'Unnamed Field')}** (`{field_id}`)"
+            for field_id in field_ids
+        )
+
+    name_groups = [ids for ids in by_name.values() if len(ids) > 1]
+    config_groups = [
+        ids for ids in by_config.values()
+        if len(ids) > 1 and not any(set(ids) <= set(group) for group in name_groups)
+    ]
+
+    if name_groups or config_groups:
+        output += "## Near-Duplicate Fields\n\n"
+        for field_ids in name_groups:
+            same_config = len({hashes[field_id] for field_id in field_ids}) == 1
+            output += f"- Same name, different IDs: {describe(field_ids)}"
+            output += " — identical configuration\n" if same_config else " — configurations differ\n"
+        for field_ids in config_groups:
+            output += f"- Identical configuration `{hashes[field_ids[0]]}`: {describe(field_ids)}\n"
+        output += "\n"
+    else:
+        output += "## Near-Duplicate Fields\n\nNone found.\n\n"
+
+    if failed:
+        output += "## Lists That Could Not Be Read\n\n"
+        for index, lst, error in failed:
+            output += f"- L{index}: {lst.get('name', 'Unnamed List')}: {error}\n"
+
+    return truncate_if_needed(output)
+
+
+# Columnar Task Store
+class Categories:
+    """Maps labels to dense integer codes for a categorical column."""
+
+    def __init__(self):
+        self.codes: dict[Any, int] = {}
+        self.labels: list[str] = []
+
+    def code(self, key: Any, label: Optional[str] = None) -> int:
+        if key not in self.codes:
+            self.codes[key] = len(self.labels)
+            self.labels.append(label if label is not None else str(key))
+        return self.codes[key]
+
+
+def to_ms(value: Any) -> float:
+    """ClickUp timestamp (ms string) to float, NaN when missing."""
+    try:
+        return float(value) if value not in (None, "") else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class TaskStore:
+    """
+    Columnar, in-memory store of tasks for vectorized analytics.
+
+    Timestamps are float64 millisecond arrays (NaN when missing), statuses,
+    lists and dropdown fields are int32 category codes, numeric custom
+    fields are float64 arrays. Multi-valued assignees are stored exploded:
+    `assignee_task[i]` is the row of the task with assignee code
+    `assignee_code[i]`. Build with `add_tasks` per page, then `finalize`.
+    """
+
+    def __init__(self):
+        self.loaded_at = time.monotonic()
+        self.size = 0
+        self.statuses = Categories()
+        self.lists = Categories()
+        self.assignees = Categories()
+        self.dropdown_categories: dict[str, Categories] = {}
+        self._rows: dict[str, list] = {
+            "date_created": [], "date_closed": [], "due_date": [],
+            "status": [], "closed": [], "list": []
+        }
+        self._assignee_task: list[int] = []
+        self._assignee_code: list[int] = []
+        self._numeric: dict[str, dict[int, float]] = {}
+        self._dropdown: dict[str, dict[int, int]] = {}
+
+    def add_tasks(self, tasks: list[dict]) -> None:
+        rows = self._rows
+        for task in tasks:
+            row = self.size
+            status = task.get("status") or {}
+            lst = task.get("list") or {}
+            rows["date_created"].append(to_ms(task.get("date_created")))
+            rows["date_closed"].append(to_ms(task.get("date_closed") or task.get("date_done")))
+            rows["due_date"].append(to_ms(task.get("due_date")))
+            rows["status"].append(self.statuses.code(status.get("status", "unknown")))
+            rows["closed"].append(status.get("type") in ("closed", "done"))
+            rows["list"].append(self.lists.code(lst.get("id"), lst.get("name") or str(lst.get("id"))))
+
+            for assignee in task.get("assignees", []):
+                self._assignee_task.append(row)
+                self._assignee_code.append(
+                    self.assignees.code(assignee.get("id"), member_directory.name(assignee))
+                )
+
+            for field in task.get("custom_fields", []):
+                name, value = field.get("name"), field.get("value")
+                if value in (None, ""):
+                    continue
+                if field.get("type") in NUMERIC_FIELD_TYPES:
+                    if isinstance(value, dict):
+                        value = value.get("current", value.get("percent_completed"))
+                    try:
+                        self._numeric.setdefault(name, {})[row] = float(value)
+                    except (TypeError, ValueError):
+                        pass
+                elif field.get("type") == "drop_down":
+                    categories = self.dropdown_categories.setdefault(name, Categories())
+                    label = flatten_custom_field_value(field)
+                    self._dropdown.setdefault(name, {})[row] = categories.code(str(label))
+
+            self.size += 1
+
+    def finalize(self) -> "TaskStore":
+        """Convert the accumulated rows into NumPy columns."""
+        rows = self._rows
+        self.date_created = np.asarray(rows["date_created"], dtype=np.float64)
+        self.date_closed = np.asarray(rows["date_closed"], dtype=np.float64)
+        self.due_date = np.asarray(rows["due_date"], dtype=np.float64)
+        self.status = np.asarray(rows["status"], dtype=np.int32)
+        self.closed = np.asarray(rows["closed"], dtype=bool)
+        self.list = np.asarray(rows["list"], dtype=np.int32)
+        self.assignee_task = np.asarray(self._assignee_task, dtype=np.int64)
+        self.assignee_code = np.asarray(self._assignee_code, dtype=np.int32)
+
+        self.numeric: dict[str, np.ndarray] = {}
+        for name, values in self._numeric.items():
+            column = np.full(self.size, np.nan)
+            column[np.fromiter(values.keys(), dtype=np.int64)] = np.fromiter(values.values(), dtype=np.float64)
+            self.numeric[name] = column
+
+        self.dropdown: dict[str, np.ndarray] = {}
+        for name, codes in self._dropdown.items():
+            column = np.full(self.size, -1, dtype=np.int32)
+            column[np.fromiter(codes.keys(), dtype=np.int64)] = np.fromiter(codes.values(), dtype=np.int32)
+            self.dropdown[name] = column
+
+        self._rows = {}
+        self._numeric = {}
+        self._dropdown = {}
+        return self
+
+
+task_stores: OrderedDict[tuple, TaskStore] = OrderedDict()
+
+
+async def load_task_store(list_ids: list[str], include_closed: bool) -> TaskStore:
+    """
+    Load (or reuse) a columnar store of all tasks in the given lists.
+
+    Lists are paged concurrently; stores are cached for
+    TASK_STORE_TTL_SECONDS so follow-up questions skip the load.
+    """
+    key = (tuple(sorted(list_ids)), include_closed)
+    store = task_stores.get(key)
+    if store is not None and time.monotonic() - store.loaded_at < TASK_STORE_TTL_SECONDS:
+        task_stores.move_to_end(key)
+        return store
+
+    await member_directory.ensure()
+    store = TaskStore()
+    params = {"include_closed": str(include_closed).lower(), "subtasks": "true"}
+
+    async def load(list_id: str) -> None:
+        async for tasks in iter_task_pages(f"/list/{list_id}/task", params=params):
+            store.add_tasks(tasks)
+
+    results = await gather_with_concurrency(load(list_id) for list_id in list_ids)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+    task_stores[key] = store.finalize()
+    while len(task_stores) > TASK_STORE_MAX:
+        task_stores.popitem(last=False)
+    return store
+
+
+def group_codes(store: TaskStore, group_by: str) -> tuple[np.ndarray, np.ndarray, Callable[[int], str]]:
+    """
+    Resolve a group-by dimension to (row_index, group_code, label_for_code).
+
+    Rows may repeat (e.g. one per assignee), so metrics are computed over
+    `values[row_index]` grouped by `group_code`.
+    """
+    rows = np.arange(store.size)
+    if group_by in ("", "none"):
+        return rows, np.zeros(store.size, dtype=np.int64), lambda code: "All tasks"
+    if group_by == "status":
+        return rows, store.status, lambda code: store.statuses.labels[code]
+    if group_by == "list":
+        return rows, store.list, lambda code: store.lists.labels[code]
+    if group_by == "assignee":
+        return store.assignee_task, store.assignee_code, lambda code: store.assignees.labels[code]
+    if group_by in ("week_created", "week_closed"):
+        dates = store.date_created if group_by == "week_created" else store.date_closed
+        valid = ~np.isnan(dates)
+        # Weeks start on Monday; the Unix epoch was a Thursday
+        weeks = np.floor((dates[valid] - 4 * DAY_MS) / WEEK_MS).astype(np.int64)
+
+        def label(code: int) -> str:
+            return datetime.fromtimestamp(
+                (code * WEEK_MS + 4 * DAY_MS) / 1000, tz=timezone.utc
+            ).strftime("%Y-%m-%d")
+        return rows[valid], weeks, label
+    if group_by in store.dropdown:
+        column = store.dropdown[group_by]
+        valid = column >= 0
+        categories = store.dropdown_categories[group_by]
+        return rows[valid], column[valid], lambda code: categories.labels[code]
+    raise ValueError(
+        f"Unknown group_by '{group_by}'. Use none, status, list, assignee, "
+        f"week_created, week_closed, or a dropdown field: {', '.join(store.dropdown) or 'none found'}"
+    )
+
+
+def metric_values(store: TaskStore, metric: str, field_name: Optional[str]) -> tuple[np.ndarray, str]:
+    """Per-task metric values (NaN where not applicable) and their unit."""
+    now = time.time() * 1000
+    if metric == "count":
+        return np.ones(store.size), "tasks"
+    if metric == "cycle_time":
+        return (store.date_closed - store.date_created) / DAY_MS, "days"
+    if metric == "age":
+        return np.where(store.closed, np.nan, (now - store.date_created) / DAY_MS), "days"
+    if metric == "overdue":
+        overdue = ~store.closed & (store.due_date < now)
+        return np.where(overdue, (now - store.due_date) / DAY_MS, np.nan), "days overdue"
+    if metric == "field":
+        if not field_name or field_name not in store.numeric:
+            raise ValueError(
+                f"Numeric field '{field_name}' not found. Available: "
+                f"{', '.join(store.numeric) or 'none'}"
+            )
+        return store.numeric[field_name], field_name
+    raise ValueError("metric must be count, cycle_time, age, overdue, or field")
+
+
+def grouped_stats(
+    values: np.ndarray,
+    rows: np.ndarray,
+    codes: np.ndarray
+) -> list[tuple[int, int, np.ndarray]]:
+    """
+    Vectorized group-by: sort once by group code, split, and compute
+    count/mean/p50/p90/min/max per group. Returns (code, n, stats) tuples.
+    """
+    values = values[rows]
+    valid = ~np.isnan(values)
+    values, codes = values[valid], np.asarray(codes)[valid]
+    if values.size == 0:
+        return []
+
+    order = np.argsort(codes, kind="stable")
+    codes, values = codes[order], values[order]
+    unique, starts = np.unique(codes, return_index=True)
+
+    results = []
+    for code, group in zip(unique, np.split(values, starts[1:])):
+        stats = np.array([
+            group.mean(), *np.percentile(group, [50, 90]), group.min(), group.max(), group.sum()
+        ])
+        results.append((int(code), group.size, stats))
+    return results
+
+
+# Time Tracking Helpers
+class StatusDwellStats:
+    """
+    Streaming aggregate of time-in-status responses.
+
+    Keeps one float per (task, status) visit and per-task lead/cycle times,
+    never the responses themselves. Lead time counts every non-closed
+    status; cycle time also excludes "open" (not started) statuses.
+    """
+
+    def __init__(self):
+        self.dwell: dict[str, list[float]] = {}
+        self.status_types: dict[str, str] = {}
+        self.current: dict[str, int] = {}
+        self.lead_times: list[float] = []
+        self.cycle_times: list[float] = []
+        self.tasks = 0
+
+    def add(self, task_status: dict) -> None:
+        lead = cycle = 0.0
+        for entry in task_status.get("status_history", []):
+            status = entry.get("status", "unknown")
+            status_type = entry.get("type", "custom")
+            minutes = float((entry.get("total_time") or {}).get("by_minute") or 0)
+            self.dwell.setdefault(status, []).append(minutes)
+            self.status_types.setdefault(status, status_type)
+            if status_type not in ("closed", "done"):
+                lead += minutes
+                if status_type != "open":
+                    cycle += minutes
+
+        current = (task_status.get("current_status") or {}).get("status")
+        if current:
+            self.current[current] = self.current.get(current, 0) + 1
+        self.lead_times.append(lead)
+        self.cycle_times.append(cycle)
+        self.tasks += 1
+
+    def summary(self) -> list[tuple[str, str, int, np.ndarray]]:
+        """(status, type, visits, [mean, p50, p90, max, total]) per status, longest total first."""
+        rows = []
+        for status, minutes in self.dwell.items():
+            values = np.asarray(minutes)
+            stats = np.array([values.mean(), *np.percentile(values, [50, 90]), values.max(), values.sum()])
+            rows.append((status, self.status_types[status], values.size, stats))
+        return sorted(rows, key=lambda row: -row[3][4])
+
+
+async def fetch_time_in_status(task_ids: list[str]) -> dict[str, dict]:
+    """Time-in-status for up to TIME_IN_STATUS_BATCH tasks, keyed by task ID."""
+    if len(task_ids) == 1:
+        # The bulk endpoint requires at least two IDs
+        return {task_ids[0]: await make_api_request(f"/task/{task_ids[0]}/time_in_status")}
+    return await make_api_request(
+        "/task/bulk_time_in_status/task_ids",
+        params={"task_ids": task_ids}
+    )
+
+
+class TimeReport:
+    """
+    Running totals of time entries per user, list and task.
+
+    Entries are folded in as each date window arrives and then dropped;
+    only the aggregates and the IDs seen (to skip duplicates at window
+    edges) are kept. Users and lists are totalled by ID, so two with the
+    same name stay apart; `labels` maps each key to its display name.
+    """
+
+    def __init__(self):
+        self.seen: set[str] = set()
+        self.total_ms = 0
+        self.billable_ms = 0
+        self.entries = 0
+        self.running = 0
+        self.by_user: dict[str, list[int]] = {}
+        self.by_list: dict[str, list[int]] = {}
+        self.by_task: dict[str, list[int]] = {}
+        self.labels: dict[str, str] = {}
+
+    @staticmethod
+    def _bump(totals: dict[str, list[int]], key: str, duration: int, billable: bool) -> None:
+        # [total_ms, billable_ms, entries]
+        row = totals.setdefault(key, [0, 0, 0])
+        row[0] += duration
+        row[1] += duration if billable else 0
+        row[2] += 1
+
+    def add(self, entries: list[dict], period_end_ms: int) -> None:
+        until_ms = min(int(time.time() * 1000), period_end_ms)
+        for entry in entries:
+            entry_id = str(entry.get("id"))
+            if entry_id in self.seen:
+                continue
+            self.seen.add(entry_id)
+
+            duration = int(entry.get("duration") or 0)
+            if duration < 0:
+                # A running timer reports a negative duration
+                duration = max(0, until_ms - int(entry.get("start") or until_ms))
+                self.running += 1
+            billable = bool(entry.get("billable"))
+
+            user = entry.get("user") or {}
+            task = entry.get("task") or {}
+            location = entry.get("task_location") or {}
+            user_key = f"user:{user.get('id')}" if user else "user:"
+            self.labels[user_key] = member_directory.name(user) if user else "Unknown"
+            list_key = f"list:{location.get('list_id') or ''}"
+            self.labels[list_key] = location.get("list_name") or (
+                f"List {location['list_id']}" if location.get("list_id") else "No list"
+            )
+            task_key = f"{task.get('name', 'Unnamed Task')} (`{task['id']}`)" if task.get("id") else "No task"
+
+            self._bump(self.by_user, user_key, duration, billable)
+            self._bump(self.by_list, list_key, duration, billable)
+            self._bump(self.by_task, task_key, duration, billable)
+            self.total_ms += duration
+            self.billable_ms += duration if billable else 0
+            self.entries += 1
+
+
+def format_time_totals(
+    title: str,
+    totals: dict[str, list[int]],
+    grand_total: int,
+    top: int,
+    labels: Optional[dict[str, str]] = None
+) -> str:
+    """Markdown table of the largest time totals in one dimension."""
+    labels = labels or {}
+    label_counts: dict[str, int] = {}
+    for key in totals:
+        label = labels.get(key, key)
+        label_counts[label] = label_counts.get(label, 0) + 1
+    output = f"\n## {title}\n\n"
+    output += "| Name | Hours | Billable | Share | Entries |\n|---|---|---|---|---|\n"
+    ranked = sorted(totals.items(), key=lambda item: -item[1][0])
+    for key, (total, billable, entries) in ranked[:top]:
+        share = total / grand_total * 100 if grand_total else 0
+        label = labels.get(key, key)
+        if label_counts[label] > 1:
+            # Same display name for different IDs: show the ID to tell them apart
+            label += f" (`{key.partition(':')[2]}`)"
+        output += (
+            f"| {label} | {total / 3_600_000:.2f} | {billable / 3_600_000:.2f} "
+            f"| {share:.1f}% | {entries} |\n"
+        )
+    if len(ranked) > top:
+        output += f"\n*{len(ranked) - top} more not shown.*\n"
+    return output
+
+
+# Import / Export Helpers
+IMPORT_TASK_COLUMNS = {
+    "name", "description", "markdown_description", "status", "priority",
+    "due_date", "start_date", "assignees", "tags"
+}
+PRIORITY_NAMES = {"urgent": 1, "high": 2, "normal": 3, "low": 4}
+TRUE_VALUES = {"true", "yes", "y", "1", "x", "✓"}
+
+
+def resolve_data_path(path: str, base_dir: Optional[str], setting: str) -> str:
+    """
+    Resolve a client-supplied file path against a configured base directory.
+
+    Relative paths are taken from the base directory; the resolved path
+    (symlinks included) must stay inside it.
+
+    Raises:
+        ValueError: If the path leaves the base directory, or no base
+                    directory is configured where one is required
+    """
+    if not base_dir:
+        if not UNRESTRICTED_FILE_ACCESS:
+            raise ValueError(f"File access is disabled on this server. Set {setting} to allow it.")
+        return path
+    base = os.path.realpath(base_dir)
+    resolved = os.path.realpath(os.path.join(base, path))
+    if os.path.commonpath([base, resolved]) != base:
+        raise ValueError(f"Path must be inside {setting} ({base}): {path}")
+    return resolved
+
+
+def iter_import_rows(file_path: str, file_format: str) -> Iterator[tuple[int, Any]]:
+    """
+    Stream rows from a CSV or NDJSON file as (row_number, row) pairs.
+
+    Rows are read lazily, so memory use does not depend on file size.
+    Row numbers are 1-based data rows (the CSV header is not counted).
+    An NDJSON line that is not a JSON object is yielded as a ValueError,
+    so one bad line fails only its own row.
+    """
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        if file_format == "csv":
+            for row_number, row in enumerate(csv.DictReader(f), 1):
+                yield row_number, row
+        else:
+            row_number = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                row_number += 1
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield row_number, ValueError(f"invalid JSON: {e}")
+                    continue
+                if not isinstance(row, dict):
+                    yield row_number, ValueError("line is not a JSON object")
+                    continue
+                yield row_number, row
+
+
+def import_row_key(list_id: str, row: dict, seen: dict[str, int]) -> str:
+    """
+    Checkpoint key of an import row: target list, row content hash, and how
+    often that content appeared before, so identical rows stay distinct.
+
+    Keys do not depend on row numbers, so editing the file keeps completed
+    rows recognized, and the same file imported into another list starts fresh.
+    """
+    content = payload_hash([[str(column), value] for column, value in row.items()])
+    seen[content] = seen.get(content, 0) + 1
+    return f"{list_id}:{content}:{seen[content]}"
+
+
+def split_values(value: Any) -> list:
+    """Split a comma-separated cell into a list; lists pass through."""
+    if isinstance(value, list):
+        return value
+    return [part.strip() for part in str(value).split(",") if part.strip()]
+
+
+def build_field_converter(field: dict) -> Callable[[Any], Any]:
+    """
+    Build a converter from a raw cell value to the value ClickUp expects
+    for this custom field, based on its definition from /list/{id}/field.
+    """
+    field_type = field.get("type")
+    options = (field.get("type_config") or {}).get("options", [])
+
+    def option_lookup(label_key: str) -> dict[str, str]:
+        lookup = {}
+        for option in options:
+            lookup[str(option.get("id"))] = option.get("id")
+            if option.get(label_key) is not None:
+                lookup[str(option[label_key]).strip().lower()] = option.get("id")
+        return lookup
+
+    if field_type == "drop_down":
+        by_name = option_lookup("name")
+        by_index = {str(o.get("orderindex")): o.get("id") for o in options}
+
+        def convert(value: Any) -> Any:
+            key = str(value).strip()
+            option_id = by_name.get(key.lower()) or by_name.get(key) or by_index.get(key)
+            if option_id is None:
+                raise ValueError(f"unknown option '{value}'")
+            return option_id
+        return convert
+
+    if field_type == "labels":
+        by_label = option_lookup("label")
+
+        def convert(value: Any) -> Any:
+            label_ids = []
+            for label in split_values(value):
+                label_id = by_label.get(str(label).strip().lower()) or by_label.get(str(label))
+                if label_id is None:
+                    raise ValueError(f"unknown label '{label}'")
+                label_ids.append(label_id)
+            return label_ids
+        return convert
+
+    if field_type in ("number", "currency", "manual_progress"):
+        return lambda value: float(str(value).replace(",", "").strip())
+
+    if field_type == "rating":
+        return lambda value: int(float(value))
+
+    if field_type == "checkbox":
+        return lambda value: value if isinstance(value, bool) else str(value).strip().lower() in TRUE_VALUES
+
+    if field_type == "date":
+        return lambda value: value if isinstance(value, int) else parse_date_ms(str(value))
+
+    if field_type == "users":
+        return lambda value: {"add": [int(user_id) for user_id in split_values(value)]}
+
+    if field_type == "tasks":
+        return lambda value: {"add": [str(task_id) for task_id in split_values(value)]}
+
+    return lambda value: value if isinstance(value, (dict, list, int, float, bool)) else str(value)
+
+
+def build_task_payload(
+    row: dict,
+    name_column: str,
+    converters: dict[str, tuple[str, Callable[[Any], Any]]]
+) -> dict[str, Any]:
+    """
+    Build a create-task request body from one import row.
+
+    Standard columns (name, description, status, priority, dates, assignees,
+    tags) map to task properties; any column matching a custom field name or
+    ID maps to that field. Empty cells are skipped.
+
+    Raises:
+        ValueError: If the row has no name or a value cannot be converted
+    """
+    payload: dict[str, Any] = {}
+    custom_fields = []
+
+    for column, value in row.items():
+        if column is None or value is None or value == "":
+            continue
+        key = column.strip().lower()
+
+        if column == name_column or key == name_column.lower():
+            payload["name"] = str(value)
+        elif key in ("description", "markdown_description", "status"):
+            payload[key] = str(value)
+        elif key == "priority":
+            priority = PRIORITY_NAMES.get(str(value).strip().lower(), value)
+            payload["priority"] = int(priority)
+        elif key in ("due_date", "start_date"):
+            payload[key] = value if isinstance(value, int) else parse_date_ms(str(value))
+        elif key == "assignees":
+            payload["assignees"] = [int(user_id) for user_id in split_values(value)]
+        elif key == "tags":
+            payload["tags"] = [str(tag) for tag in split_values(value)]
+        elif key in converters:
+            field_id, convert = converters[key]
+            try:
+                custom_fields.append({"id": field_id, "value": convert(value)})
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"column '{column}': {e}")
+
+    if not payload.get("name"):
+        raise ValueError(f"missing task name (column '{name_column}')")
+    if custom_fields:
+        payload["custom_fields"] = custom_fields
+    return payload
+
+
+def load_checkpoint(checkpoint_path: str) -> dict[str, str]:
+    """Load a tab-separated checkpoint log of completed keys and their values."""
+    completed = {}
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                key, _, value = line.rstrip("\n").partition("\t")
+                if key:
+                    completed[key] = value
+    return completed
+
+
+EXPORT_COLUMNS = [
+    "id", "custom_id", "name", "status", "status_type", "priority",
+    "assignees", "assignee_ids", "tags", "creator", "parent",
+    "date_created", "date_updated", "date_closed", "due_date", "start_date",
+    "time_estimate", "list_id", "list_name", "folder_name", "space_id", "url",
+    "description"
+]
+
+
+def flatten_custom_field_value(field: dict) -> Any:
+    """Flatten a task's custom field value into a scalar for export."""
+    value = field.get("value")
+    if value is None or value == "":
+        return None
+
+    field_type = field.get("type")
+    options = (field.get("type_config") or {}).get("options", [])
+
+    if field_type == "drop_down":
+        for option in options:
+            if value in (option.get("orderindex"), option.get("id")):
+                return option.get("name")
+        return value
+    if field_type == "labels" and isinstance(value, list):
+        labels = {option.get("id"): option.get("label") for option in options}
+        return "; ".join(str(labels.get(label_id, label_id)) for label_id in value)
+    if field_type == "users" and isinstance(value, list):
+        return "; ".join(member_directory.name(user) for user in value)
+    if isinstance(value, list):
+        return "; ".join(
+            str(item.get("username") or item.get("name") or item.get("id"))
+            if isinstance(item, dict) else str(item)
+            for item in value
+        )
+    if isinstance(value, dict):
+        return json.dumps(value, default=str)
+    return value
+
+
+def flatten_task(task: dict) -> dict[str, Any]:
+    """Flatten a task into one export row, custom fields as `cf:<name>` columns."""
+    assignees = task.get("assignees", [])
+    row = {
+        "id": task.get("id"),
+        "custom_id": task.get("custom_id"),
+        "name": task.get("name"),
+        "status": (task.get("status") or {}).get("status"),
+        "status_type": (task.get("status") or {}).get("type"),
+        "priority": (task.get("priority") or {}).get("priority"),
+        "assignees": "; ".join(member_directory.name(a) for a in assignees),
+        "assignee_ids": "; ".join(str(a.get("id")) for a in assignees),
+        "tags": "; ".join(tag.get("name", "") for tag in task.get("tags", [])),
+        "creator": member_directory.name(task["creator"]) if task.get("creator") else None,
+        "parent": task.get("parent"),
+        "date_created": task.get("date_created"),
+        "date_updated": task.get("date_updated"),
+        "date_closed": task.get("date_closed"),
+        "due_date": task.get("due_date"),
+        "start_date": task.get("start_date"),
+        "time_estimate": task.get("time_estimate"),
+        "list_id": (task.get("list") or {}).get("id"),
+        "list_name": (task.get("list") or {}).get("name"),
+        "folder_name": (task.get("folder") or {}).get("name"),
+        "space_id": (task.get("space") or {}).get("id"),
+        "url": task.get("url"),
+        "description": task.get("text_content") or task.get("description")
+    }
+    for field in task.get("custom_fields", []):
+        row[f"cf:{field.get('name')}"] = flatten_custom_field_value(field)
+    return row
+
+
+async def export_list_tasks(
+    lst: dict,
+    output_dir: str,
+    file_format: str,
+    params: dict
+) -> int:
+    """
+    Stream every task in a list to `<output_dir>/<list_id>.<format>`.
+
+    Only one wave of pages is held in memory at a time; rows are written as
+    soon as each page arrives. Returns the number of tasks written.
+    """
+    list_id = lst.get("id")
+    path = os.path.join(output_dir, f"{list_id}.{file_format}")
+
+    writer = None
+    if file_format == "csv":
+        fields_data = await make_api_request(f"/list/{list_id}/field")
+        columns = EXPORT_COLUMNS + [
+            f"cf:{field.get('name')}" for field in fields_data.get("fields", [])
+        ]
+
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+
+        async for tasks in iter_task_pages(
+            f"/list/{list_id}/task", params=params, concurrency=EXPORT_PAGE_CONCURRENCY
+        ):
+            for task in tasks:
+                row = flatten_task(task)
+                if writer:
+                    writer.writerow(row)
+                else:
+                    f.write(json.dumps(row, default=str) + "\n")
+            count += len(tasks)
+
+    return count
+
+
+# Workspace Snapshots
+def snapshot_node(kind: str, node_id: Any, attrs: dict, children: list[dict]) -> dict:
+    """
+    Build a content-hashed snapshot node.
+
+    The hash covers the node's own attributes and its children's hashes
+    (Merkle-style), so two nodes with equal hashes have identical subtrees
+    and can be skipped during a diff.
+    """
+    child_hashes = sorted(f"{child['kind']}:{child['id']}:{child['hash']}" for child in children)
+    payload = json.dumps([kind, attrs, child_hashes], sort_keys=True, default=str)
+    return {
+        "kind": kind,
+        "id": str(node_id),
+        "attrs": attrs,
+        "hash": hashlib.sha1(payload.encode()).hexdigest(),
+        "size": 1 + sum(child["size"] for child in children),
+        "children": {f"{child['kind']}:{child['id']}": child for child in children}
+    }
+
+
+def status_names(statuses: list[dict]) -> list[str]:
+    """Describe statuses as 'name (type)' strings in workflow order."""
+    return [f"{s.get('status')} ({s.get('type')})" for s in statuses or []]
+
+
+def list_snapshot(lst: dict, fields: list[dict]) -> dict:
+    """Snapshot a list and its custom field set."""
+    field_nodes = [
+        snapshot_node("field", field.get("id"), {
+            "name": field.get("name"),
+            "type": field.get("type"),
+            "config": field_config_hash(field),
+            "required": field.get("required", False)
+        }, [])
+        for field in fields
+    ]
+    return snapshot_node("list", lst.get("id"), {
+        "name": lst.get("name"),
+        "archived": lst.get("archived", False),
+        "statuses": status_names(lst.get("statuses", []))
+    }, [snapshot_node("fields", lst.get("id"), {}, field_nodes)])
+
+
+async def build_space_snapshot(space_id: str) -> dict:
+    """Fetch a space's hierarchy and custom fields and build its snapshot tree."""
+    space, lists = await asyncio.gather(
+        make_api_request(f"/space/{space_id}"),
+        get_space_lists(space_id)
+    )
+
+    responses = await gather_with_concurrency(
+        make_api_request(f"/list/{lst.get('id')}/field") for lst in lists
+    )
+    list_nodes: dict[str, dict] = {}
+    for lst, response in zip(lists, responses):
+        if isinstance(response, BaseException):
+            raise response
+        list_nodes[lst.get("id")] = list_snapshot(lst, response.get("fields", []))
+
+    folders: dict[str, dict] = {}
+    folderless = []
+    for lst in lists:
+        folder = lst.get("folder")
+        if folder and folder.get("id"):
+            folders.setdefault(folder["id"], {"name": folder.get("name"), "lists": []})
+            folders[folder["id"]]["lists"].append(list_nodes[lst.get("id")])
+        else:
+            folderless.append(list_nodes[lst.get("id")])
+
+    children = [
+        snapshot_node("folder", folder_id, {"name": folder["name"]}, folder["lists"])
+        for folder_id, folder in folders.items()
+    ] + folderless
+
+    return snapshot_node("space", space_id, {
+        "name": space.get("name"),
+        "private": space.get("private", False),
+        "statuses": status_names(space.get("statuses", []))
+    }, children)
+
+
+def diff_snapshots(old: dict, new: dict, path: str = "") -> tuple[list[str], int]:
+    """
+    Compare two snapshot trees, skipping subtrees whose hashes match.
+
+    Returns:
+        (changes, skipped) where changes are markdown bullet lines and
+        skipped is the number of nodes inside unchanged subtrees
+    """
+    if old["hash"] == new["hash"]:
+        return [], new["size"]
+
+    label = f"{new['kind']} **{new['attrs'].get('name') or new['id']}**"
+    where = f" in {path}" if path else ""
+    changes = []
+    skipped = 0
+
+    for key in sorted(set(old["attrs"]) | set(new["attrs"])):
+        before, after = old["attrs"].get(key), new["attrs"].get(key)
+        if before == after:
+            continue
+        if key == "name":
+            changes.append(f"- ✏️ Renamed {old['kind']} **{before}** → **{after}** (`{new['id']}`){where}")
+        elif key == "config":
+            changes.append(f"- ✏️ Configuration of {label}{where} changed")
+        elif isinstance(before, list) or isinstance(after, list):
+            added = [v for v in after or [] if v not in (before or [])]
+            removed = [v for v in before or [] if v not in (after or [])]
+            detail = []
+            if added:
+                detail.append(f"added {', '.join(added)}")
+            if removed:
+                detail.append(f"removed {', '.join(removed)}")
+            if not detail:
+                detail.append("reordered")
+            changes.append(f"- ✏️ {key.title()} of {label}{where}: {'; '.join(detail)}")
+        else:
+            changes.append(f"- ✏️ {key.title()} of {label}{where}: {before} → {after}")
+
+    # Field sets are transparent containers: report their children under the list
+    child_path = path if new["kind"] == "fields" else f"{path} / {new['attrs'].get('name')}".strip(" /")
+    for key in sorted(set(old["children"]) | set(new["children"])):
+        before, after = old["children"].get(key), new["children"].get(key)
+        if before is None:
+            changes.append(
+                f"- ➕ Added {after['kind']} **{after['attrs'].get('name')}** (`{after['id']}`) in {child_path}"
+            )
+        elif after is None:
+            changes.append(
+                f"- ➖ Removed {before['kind']} **{before['attrs'].get('name')}** (`{before['id']}`) from {child_path}"
+            )
+        else:
+            child_changes, child_skipped = diff_snapshots(before, after, child_path)
+            changes.extend(child_changes)
+            skipped += child_skipped
+
+    return changes, skipped
+
+
+# Startup Warmup
+warmup_state: dict[str, Any] = {"status": "idle", "spaces": 0, "lists": 0, "errors": 0}
+warmup_done = asyncio.Event()
+warmup_task: Optional[asyncio.Task] = None
+
+
+def warmup_targets() -> tuple[list[str], list[str]]:
+    """
+    Team and space IDs to preload, from CLICKUP_WARMUP_TEAMS/SPACES
+    (comma-separated) and CLICKUP_WARMUP_FILE (JSON: {"teams": [...], "spaces": [...]}).
+    """
+    teams = [t.strip() for t in WARMUP_TEAMS.split(",") if t.strip()]
+    spaces = [s.strip() for s in WARMUP_SPACES.split(",") if s.strip()]
+    if WARMUP_FILE:
+        with open(WARMUP_FILE, encoding="utf-8") as f:
+            config = json.load(f)
+        teams += [str(t) for t in config.get("teams", [])]
+        spaces += [str(s) for s in config.get("spaces", [])]
+    return list(dict.fromkeys(teams)), list(dict.fromkeys(spaces))
+
+
+async def warm_up(teams: list[str], spaces: list[str]) -> None:
+    """Fill the hierarchy and custom-field cache for the configured workspaces."""
+    params = {"archived": "false"}
+    team_spaces, _ = await asyncio.gather(
+        gather_with_concurrency(
+            make_api_request(f"/team/{team_id}/space", params=params) for team_id in teams
+        ),
+        member_directory.ensure()
+    )
+    for result in team_spaces:
+        if isinstance(result, BaseException):
+            warmup_state["errors"] += 1
+        else:
+            spaces += [str(space.get("id")) for space in result.get("spaces", [])]
+    spaces = list(dict.fromkeys(spaces))
+    warmup_state["spaces"] = len(spaces)
+
+    space_results = await gather_with_concurrency(
+        get_space_lists(space_id) for space_id in spaces
+    )
+    await gather_with_concurrency(make_api_request(f"/space/{space_id}") for space_id in spaces)
+
+    lists = []
+    for result in space_results:
+        if isinstance(result, BaseException):
+            warmup_state["errors"] += 1
+        else:
+            lists.extend(result)
+    warmup_state["lists"] = len(lists)
+
+    results = await gather_with_concurrency(
+        make_api_request(endpoint)
+        for lst in lists
+        for endpoint in (f"/list/{lst.get('id')}", f"/list/{lst.get('id')}/field")
+    )
+    warmup_state["errors"] += sum(1 for r in results if isinstance(r, BaseException))
+
+
+async def run_warmup() -> None:
+    """
+    Run the startup warmup under WARMUP_TIMEOUT_SECONDS and mark the server
+    ready when it finishes, fails, or runs out of time.
+    """
+    started = time.monotonic()
+    try:
+        teams, spaces = warmup_targets()
+        if not teams and not spaces:
+            warmup_state["status"] = "skipped"
+            return
+        warmup_state["status"] = "running"
+        tool_deadline.set(asyncio.get_running_loop().time() + WARMUP_TIMEOUT_SECONDS)
+        background_request.set(True)
+        async with asyncio.timeout(WARMUP_TIMEOUT_SECONDS):
+            await warm_up(teams, spaces)
+        warmup_state["status"] = "done"
+    except TimeoutError:
+        warmup_state["status"] = "timed_out"
+    except Exception as e:
+        warmup_state["status"] = f"failed: {e}"
+    finally:
+        warmup_state["seconds"] = round(time.monotonic() - started, 1)
+        warmup_done.set()
+
+
+def start_warmup() -> asyncio.Task:
+    """Start the warmup in the background; readiness waits on `warmup_done`."""
+    global warmup_task
+    # Keep a strong reference: the event loop only holds tasks weakly
+    warmup_task = asyncio.create_task(run_warmup())
+    return warmup_task
+
+
+def server_status() -> dict[str, Any]:
+    """Snapshot of the server's internal state for monitoring."""
+    return {
+        "circuit_breakers": {
+            name: {
+                "state": breaker.state,
+                "failure_ratio": round(breaker.failure_ratio(), 3),
+                "requests_in_window": len(breaker.outcomes),
+                "times_opened": breaker.times_opened,
+                "rejected": breaker.rejected,
+                "retry_in_seconds": round(breaker.retry_in(), 1) if breaker.state == "open" else 0
+            }
+            for name, breaker in sorted(circuit_breakers.items())
+        },
+        "admission": {
+            "tool_calls": tool_limiter.status(),
+            "upstream_requests": upstream_limiter.status()
+        },
+        "rate_limiter": {
+            "per_minute": RATE_LIMIT_PER_MINUTE,
+            "tokens_available": round(rate_limiter.tokens, 1),
+            "paused_for_seconds": round(max(0.0, rate_limiter.paused_until - time.monotonic()), 1)
+        },
+        "oversized_responses": dict(sorted(oversized_responses.items())),
+        "cassette": cassette.status(),
+        "compression": {
+            **transfer_stats,
+            "ratio": round(transfer_stats["body_bytes"] / transfer_stats["wire_bytes"], 2)
+            if transfer_stats["wire_bytes"] else None
+        },
+        "hedging": {
+            "enabled": HEDGE_REQUESTS,
+            "hedges_sent": hedge_budget.total_hedges,
+            "hedges_won": hedge_budget.hedge_wins
+        },
+        "response_cache": {
+            "entries": len(response_cache.entries),
+            "hits": response_cache.hits,
+            "misses": response_cache.misses,
+            "stale_served": response_cache.stale_served
+        },
+        "prefetch": {
+            "enabled": prefetcher.enabled,
+            "pending": len(prefetcher.pending),
+            "completed": prefetcher.completed,
+            "skipped": prefetcher.skipped
+        },
+        "warmup": {**warmup_state, "ready": warmup_done.is_set()},
+        "member_directory": {
+            "members": len(member_directory.members),
+            "age_seconds": round(time.monotonic() - member_directory.loaded_at) if member_directory.loaded_at else None
+        },
+        "event_loop": loop_monitor.status(),
+        "worker_pool": worker_pool.status(),
+        "slow_sections": {
+            label: (
+                f"{stats['count']}x, max {stats['max_ms']:.0f} ms, "
+                f"total {stats['total_ms']:.0f} ms, last tool {stats['last_tool']}"
+            )
+            for label, stats in sorted(loop_monitor.slow_sections.items(), key=lambda item: -item[1]["total_ms"])
+        },
+        "render_cache": {
+            "entries": len(render_cache.entries),
+            "chars": render_cache.chars,
+            "hits": render_cache.hits,
+            "misses": render_cache.misses
+        }
+    }
+
+
+def format_server_status(status: dict[str, Any]) -> str:
+    """Format the server status snapshot into markdown."""
+    output = "# Server Status\n\n"
+    for section, values in status.items():
+        output += f"## {section.replace('_', ' ').title()}\n\n"
+        if not values:
+            output += "- None yet\n"
+        for key, value in values.items():
+            if isinstance(value, dict):
+                details = ", ".join(f"{k}: {v}" for k, v in value.items())
+                output += f"- **{key}**: {details}\n"
+            else:
+                output += f"- **{key.replace('_', ' ').title()}**: {value}\n"
+        output += "\n"
+    return output
+
+
+# MCP Tools
+@mcp.tool()
+@guarded_tool()
+async def get_authorized_user() -> str:
+    """
+    Get information about the currently authenticated ClickUp user.
+
+    This tool returns the user's profile information including name, email,
+    workspace memberships, and account details.
+
+    Use this tool to:
+    - Verify authentication is working correctly
+    - Get the user's team (workspace) IDs for other operations
+    - Understand what workspaces the user has access to
+
+    Returns:
+        Markdown formatted user information including workspaces
+
+    Example usage:
+        - "Show me my ClickUp profile"
+        - "What workspaces do I have access to?"
+        - "Get my team IDs"
+    """
+    try:
+        data = await make_api_request("/user")
+        user = data.get("user", {})
+
+        output = f"# ClickUp User Profile\n\n"
+        output += f"**Name**: {user.get('username', 'N/A')}\n"
+        output += f"**Email**: {user.get('email', 'N/A')}\n"
+        output += f"**ID**: `{user.get('id')}`\n"
+        output += f"**Color**: {user.get('color', 'N/A')}\n\n"
+
+        # Workspaces (teams)
+        teams = data.get("user", {}).get("teams", [])
+        prefetcher.schedule(
+            (f"/team/{team.get('id')}/space", {"archived": "false"}) for team in teams
+        )
+        if teams:
+            output += f"## Workspaces ({len(teams)} total)\n\n"
+            for team in teams:
+                output += f"### {team.get('name', 'Unnamed Workspace')}\n"
+                output += f"- **ID**: `{team.get('id')}` (use this for get_spaces)\n"
+                output += f"- **Color**: {team.get('color', 'N/A')}\n"
+                output += f"- **Avatar**: {team.get('avatar', 'None')}\n\n"
+
+        return truncate_if_needed(output)
+
+    except Exception as e:
+        return f"Error getting user information: {str(e)}"
+
+
+@mcp.tool()
+@guarded_tool()
+async def get_spaces(team_id: str, archived: bool = False) -> str:
+    """
+    Get all spaces in a ClickUp workspace (team).
+
+    Spaces are the top-level organizational containers in ClickUp, containing
+    folders, lists, and tasks. This tool returns an overview of all spaces
+    with their basic information and status configuration.
+
+    Args:
+        team_id: The workspace (team) ID. Get this from get_authorized_user tool.
+                 Example: "9012345678"
+        archived: Include archived spaces in results. Default: false
+
+    Returns:
+        Markdown formatted list of spaces with their IDs and key properties
+
+    Use this tool to:
+    - Discover what spaces exist in a workspace
+    - Get space IDs for further exploration
+    - See space status configurations
+
+    Example usage:
+        - "List all spaces in workspace 9012345678"
+        - "Show me the spaces including archived ones"
+        - "What spaces are in my workspace?"
+    """
+    try:
+        params = {"archived": str(archived).lower()}
+        data = await make_api_request(f"/team/{team_id}/space", params=params)
+        spaces = data.get("spaces", [])
+        prefetcher.schedule(
+            request
+            for space in spaces
+            for request in (
+                (f"/space/{space.get('id')}/folder", {"archived": "false"}),
+                (f"/space/{space.get('id')}/list", {"archived": "false"}),
+                (f"/space/{space.get('id')}", None)
+            )
+        )
+
+        return format_spaces_response(spaces)
+
+    except Exception as e:
+        return f"Error getting spaces: {str(e)}"
+
+
+@mcp.tool()
+@guarded_tool()
+async def get_space_details(space_id: str) -> str:
+    """
+    Get detailed information about a specific ClickUp space.
+
+    This tool returns comprehensive information about a space including:
+    - Basic space properties (name, privacy, archived status)
+    - All status configurations
+    - Folder structure with nested lists
+    - Folderless lists
+
+    Args:
+        space_id: The space ID. Get this from get_spaces tool.
+                  Example: "90120012345"
+
+    Returns:
+        Markdown formatted detailed space information including folders and lists
+
+    Use this tool to:
+    - Explore the structure of a specific space
+    - Find list IDs for getting custom fields
+    - Understand the organizational hierarchy
+    - See all available statuses in the space
+
+    Example usage:
+        - "Show me details for space 90120012345"
+        - "What folders and lists are in this space?"
+        - "Get the structure of space X"
+    """
+    try:
+        data = await make_api_request(f"/space/{space_id}")
+        prefetch_list_details(
+            [lst for folder in data.get("folders", []) for lst in folder.get("lists", [])]
+            + data.get("lists", [])
+        )
+
+        return format_space_details(data)
+
+    except Exception as e:
+        return f"Error getting space details: {str(e)}"
+
+
+@mcp.tool()
+@guarded_tool()
+async def get_list_custom_fields(list_id: str) -> str:
+    """
+    Get all custom fields (columns) configured for a specific list.
+
+    Custom fields are the columns you see in ClickUp lists. They can be various
+    types like text, number, dropdown, date, etc. This tool shows all custom
+    fields available on a list with their configuration.
+
+    Args:
+        list_id: The list ID. Get this from get_space_details tool.
+                 Example: "901200567890"
+
+    Returns:
+        Markdown formatted list of custom fields with types and configuration
+
+    Supported field types include:
+    - text, short_text (text inputs)
+    - number, currency (numeric values)
+    - drop_down, labels (selection fields)
+    - date (date picker)
+    - checkbox (boolean)
+    - email, phone, url (formatted text)
+    - users, tasks (relationship fields)
+    - And more...
+
+    Use this tool to:
+    - Discover what custom fields are available on a list
+    - Understand field types and configurations
+    - See field IDs for task operations
+    - Check if fields are required or hidden from guests
+
+    Example usage:
+        - "What custom fields are on list 901200567890?"
+        - "Show me the columns for this list"
+        - "Get custom field configuration for list X"
+    """
+    try:
+        data = await make_api_request(f"/list/{list_id}/field")
+        fields = data.get("fields", [])
+
+        return await worker_pool.render(format_custom_fields, fields)
+
+    except Exception as e:
+        return f"Error getting custom fields: {str(e)}"
+
+
+@mcp.tool()
+@guarded_tool()
+async def get_folderless_lists(space_id: str, archived: bool = False) -> str:
+    """
+    Get all lists that are not inside folders in a space.
+
+    In ClickUp, lists can exist directly in a space without being inside a folder.
+    This tool returns those "folderless" lists with their basic information.
+
+    Args:
+        space_id: The space ID. Get this from get_spaces tool.
+                  Example: "90120012345"
+        archived: Include archived lists in results. Default: false
+
+    Returns:
+        Markdown formatted list of folderless lists with their IDs
+
+    Use this tool to:
+    - Find lists at the space level
+    - Get list IDs for viewing custom fields
+    - Discover lists not organized in folders
+
+    Example usage:
+        - "Show folderless lists in space 90120012345"
+        - "What lists are directly in this space?"
+        - "Get lists not in any folder"
+    """
+    try:
+        params = {"archived": str(archived).lower()}
+        data = await make_api_request(f"/space/{space_id}/list", params=params)
+        lists = data.get("lists", [])
+        prefetch_list_details(lists)
+
+        if not lists:
+            return "No folderless lists found in this space."
+
+        output = f"# Folderless Lists ({len(lists)} total)\n\n"
+
+        for lst in lists:
+            output += f"## {lst.get('name', 'Unnamed List')}\n"
+            output += f"- **ID**: `{lst.get('id')}` (use with get_list_custom_fields)\n"
+            output += f"- **Archived**: {lst.get('archived', False)}\n"
+            output += f"- **Task Count**: {lst.get('task_count', 0)}\n"
+
+            if 'status' in lst:
+                status = lst['status']
+                output += f"- **Status**: {status.get('status', 'N/A')}\n"
+
+            output += "\n"
+
+        return truncate_if_needed(output)
+
+    except Exception as e:
+        return f"Error getting folderless lists: {str(e)}"
+
+
+@mcp.tool()
+@guarded_tool()
+async def get_folders(space_id: str, archived: bool = False) -> str:
+    """
+    Get all folders in a ClickUp space with their lists.
+
+    This is the KEY tool for auditing workspace structure. Returns complete
+    folder hierarchy with all lists, task counts, and IDs needed for deeper analysis.
+
+    Args:
+        space_id: The space ID. Get this from get_spaces tool.
+                  Example: "90120012345"
+        archived: Include archived folders. Default: false
+
+    Returns:
+        Markdown formatted folder structure with lists and task counts
+
+    Use this tool to:
+    - Audit complete workspace structure
+    - Find all lists organized in folders
+    - Get list IDs for custom field analysis
+    - See task distribution across lists
+    - Identify organizational patterns
+
+    Example usage:
+        - "Show me all folders in space X"
+        - "Audit the structure of Austin's workspace"
+        - "What lists exist in this space?"
+    """
+    try:
+        params = {"archived": str(archived).lower()}
+        data = await make_api_request(f"/space/{space_id}/folder", params=params)
+        folders = data.get("folders", [])
+        prefetch_list_details([lst for folder in folders for lst in folder.get("lists", [])])
+
+        if not folders:
+            return "No folders found in this space."
+
+        output = f"# Folders ({len(folders)} total)\n\n"
+
+        total_lists = 0
+        total_tasks = 0
+
+        for folder in folders:
+            folder_name = folder.get('name', 'Unnamed Folder')
+            folder_id = folder.get('id')
+            hidden = folder.get('hidden', False)
+
+            output += f"## 📁 {folder_name}\n"
+            output += f"- **Folder ID**: `{folder_id}`\n"
+            output += f"- **Hidden**: {hidden}\n"
+
+            lists = folder.get('lists', [])
+            if lists:
+                output += f"- **Lists**: {len(lists)}\n\n"
+                for lst in lists:
+                    list_name = lst.get('name', 'Unnamed List')
+                    list_id = lst.get('id')
+                    task_count = lst.get('task_count', 0)
+
+                    total_lists += 1
+                    total_tasks += task_count
+
+                    output += f"   📋 **{list_name}**\n"
+                    output += f"      - List ID: `{list_id}`\n"
+                    output += f"      - Tasks: {task_count}\n"
+                    output += f"      - Archived: {lst.get('archived', False)}\n"
+
+                    if 'folder' in lst:
+                        output += f"      - Folder: {lst['folder'].get('name', 'N/A')}\n"
+                    output += "\n"
+            else:
+                output += "- **Lists**: None\n\n"
+
+        output += f"\n---\n**Summary**: {len(folders)} folders, {total_lists} lists, {total_tasks} total tasks\n"
+
+        return truncate_if_needed(output)
+
+    except Exception as e:
+        return f"Error getting folders: {str(e)}"
+
+
+@mcp.tool()
+@guarded_tool()
+async def get_list_details(list_id: str) -> str:
+    """
+    Get detailed information about a specific list including all custom fields.
+
+    This tool provides comprehensive list analysis including structure, fields,
+    statuses, and configuration - essential for workflow audit.
+
+    Args:
+        list_id: The list ID. Get this from get_folders or get_space_details.
+                 Example: "901200567890"
+
+    Returns:
+        Markdown formatted detailed list information with custom fields
+
+    Use this tool to:
+    - Audit list configuration and custom fields
+    - Understand data structure for each list
+    - See available statuses and priorities
+    - Check assignees and permissions
+    - Prepare for automation recommendations
+
+    Example usage:
+        - "Show me details for Lead Tracker list"
+        - "What fields are in list 901111375515?"
+        - "Audit the structure of this list"
+    """
+    try:
+        # Fetch list, custom fields and member names concurrently
+        data, fields_data, _ = await asyncio.gather(
+            make_api_request(f"/list/{list_id}"),
+            make_api_request(f"/list/{list_id}/field"),
+            member_directory.ensure(),
+            return_exceptions=True
+        )
+        if isinstance(data, BaseException):
+            raise data
+        if not isinstance(fields_data, BaseException):
+            field_decoders.load(list_id, fields_data.get("fields", []))
+        prefetcher.schedule([(f"/list/{list_id}/task", task_page_params(0))])
+
+        output = f"# List: {data.get('name', 'Unnamed')}\n\n"
+        output += f"**ID**: `{data.get('id')}`\n"
+        output += f"**Archived**: {data.get('archived', False)}\n"
+        output += f"**Task Count**: {data.get('task_count', 0)}\n"
+
+        # Folder context
+        if 'folder' in data:
+            folder = data['folder']
+            output += f"**Folder**: {folder.get('name')} (ID: `{folder.get('id')}`)\n"
+
+        # Space context
+        if 'space' in data:
+            space = data['space']
+            output += f"**Space**: {space.get('name')} (ID: `{space.get('id')}`)\n"
+
+        output += "\n"
+
+        # Statuses
+        if 'statuses' in data:
+            statuses = data['statuses']
+            output += f"## Statuses ({len(statuses)} total)\n\n"
+            for status in statuses:
+                status_name = status.get('status', 'Unknown')
+                status_type = status.get('type', 'N/A')
+                color = status.get('color', 'N/A')
+                output += f"- **{status_name}** (Type: {status_type}, Color: {color})\n"
+            output += "\n"
+
+        # Priority
+        if 'priority' in data:
+            priority = data['priority']
+            if priority:
+                output += f"## Priority\n\n"
+                output += f"**Enabled**: {priority.get('enabled', False)}\n"
+                if 'priorities' in priority:
+                    for p in priority['priorities']:
+                        output += f"- {p.get('priority')} (Color: {p.get('color')})\n"
+                output += "\n"
+
+        # Due dates
+        if 'due_date_time' in data:
+            output += f"**Due Dates**: {data.get('due_date_time', False)}\n"
+
+        # Assignees
+        if 'assignees' in data:
+            assignees = data['assignees']
+            if assignees:
+                output += f"\n## Assignees ({len(assignees)} total)\n\n"
+                for assignee in assignees:
+                    output += f"- {member_directory.name(assignee)} (ID: {assignee.get('id')})\n"
+                output += "\n"
+
+        # Get custom fields for this list
+        try:
+            if isinstance(fields_data, BaseException):
+                raise fields_data
+            fields = fields_data.get("fields", [])
+
+            if fields:
+                output += f"## Custom Fields ({len(fields)} total)\n\n"
+                for field in fields:
+                    output += f"### {field.get('name', 'Unnamed')}\n"
+                    output += f"- **ID**: `{field.get('id')}`\n"
+                    output += f"- **Type**: {field.get('type', 'unknown')}\n"
+                    output += f"- **Required**: {field.get('required', False)}\n"
+
+                    # Type-specific config
+                    type_config = field.get('type_config', {})
+                    if type_config:
+                        output += "- **Config**:\n"
+                        for key, value in list(type_config.items())[:5]:  # Limit config details
+                            output += f"  - {key}: {value}\n"
+                    output += "\n"
+        except Exception:
+            output += "\n*Custom fields: Unable to retrieve*\n"
+
+        return truncate_if_needed(output)
+
+    except Exception as e:
+        return f"Error getting list details: {str(e)}"
 
-    # Statuses
-    if 'statuses' in space:
-        output += "## Statuses\n\n"
-        for status in space['statuses']:
-            status_name = status.get('status', 'Unknown')
-            status_type = status.get('type', '')
-            color = status.get('color', '')
-            output += f"- **{status_name}** (Type: {status_type}, Color: {color})\n"
-        output += "\n"
 
-    # Folders
-    if 'folders' in space:
-        folders = space['folders']
-        output += f"## Folders ({len(folders)} total)\n\n"
-        for folder in folders:
-            output += f"### {folder.get('name', 'Unnamed Folder')}\n"
-            output += f"- **ID**: `{folder.get('id')}`\n"
-            output += f"- **Hidden**: {folder.get('hidden', False)}\n"
+@mcp.tool()
+@guarded_tool()
+async def get_tasks(
+    list_id: str,
+    page: int = 0,
+    limit: int = 10,
+    include_subtasks: bool = False
+) -> str:
+    """
+    Get sample tasks from a list to understand data structure and usage patterns.
 
-            if 'lists' in folder:
-                lists = folder['lists']
-                output += f"- **Lists**: {len(lists)}\n"
-                for lst in lists:
-                    output += f"  - {lst.get('name')} (ID: `{lst.get('id')}`)\n"
-            output += "\n"
+    Use this to see real examples of how the list is being used, what data
+    is being tracked, and how custom fields are filled out.
 
-    # Lists (folderless)
-    if 'lists' in space:
-        lists = space['lists']
-        output += f"## Lists ({len(lists)} folderless)\n\n"
-        for lst in lists:
-            output += f"- **{lst.get('name', 'Unnamed List')}** (ID: `{lst.get('id')}`)\n"
+    Args:
+        list_id: The list ID. Get from get_folders or get_list_details.
+                 Example: "901200567890"
+        page: Page number for pagination (0-indexed). Default: 0
+        limit: Number of tasks to return (1-100). Default: 10
+        include_subtasks: Include subtasks alongside top-level tasks
+                          (each shows its parent task ID). Default: false
 
-    return truncate_if_needed(output)
+    Returns:
+        Markdown formatted task information with custom field values
 
+    Use this tool to:
+    - See real data examples from lists
+    - Understand how custom fields are used
+    - Analyze data quality and completeness
+    - Identify patterns for automation
+    - Get insights for recommendations
 
-def format_custom_fields(fields: list[dict]) -> str:
-    """Format custom fields into readable markdown."""
-    if not fields:
-        return "No custom fields found for this list."
+    Example usage:
+        - "Show me sample tasks from Lead Tracker"
+        - "What data is in the first 5 tasks of this list?"
+        - "Analyze task structure in list X"
+    """
+    try:
+        params = task_page_params(page, subtasks=include_subtasks)
+
+        # Fetch tasks, list info (for context), field definitions (for
+        # decoding values) and member names concurrently
+        data, list_data, fields_data, _ = await asyncio.gather(
+            make_api_request(f"/list/{list_id}/task", params=params),
+            make_api_request(f"/list/{list_id}"),
+            make_api_request(f"/list/{list_id}/field"),
+            member_directory.ensure(),
+            return_exceptions=True
+        )
+        if isinstance(data, BaseException):
+            raise data
+        tasks = data.get("tasks", [])
+        if not isinstance(fields_data, BaseException):
+            field_decoders.load(list_id, fields_data.get("fields", []))
 
-    output = f"# Custom Fields ({len(fields)} total)\n\n"
+        if not tasks:
+            return f"No tasks found in list {list_id}"
 
-    for field in fields:
-        output += f"## {field.get('name', 'Unnamed Field')}\n"
-        output += f"- **ID**: `{field.get('id')}`\n"
-        output += f"- **Type**: {field.get('type', 'unknown')}\n"
-        output += f"- **Required**: {field.get('required', False)}\n"
-        output += f"- **Hidden from guests**: {field.get('hide_from_guests', False)}\n"
+        if isinstance(list_data, BaseException):
+            list_data = {}
+        list_name = list_data.get('name', 'Unknown List')
 
-        # Type-specific configuration
-        type_config = field.get('type_config', {})
-        if type_config:
-            output += "- **Configuration**:\n"
-            for key, value in type_config.items():
-                output += f"  - {key}: {value}\n"
+        output = f"# Tasks from: {list_name}\n\n"
+        output += f"**Showing {min(limit, len(tasks))} of {len(tasks)} tasks**\n\n"
 
-        output += "\n"
+        output += await worker_pool.render(render_tasks, tasks[:limit])
 
-    return truncate_if_needed(output)
+        return truncate_if_needed(output)
+
+    except Exception as e:
+        return f"Error getting tasks: {str(e)}"
 
 
-# MCP Tools
 @mcp.tool()
-async def get_authorized_user() -> str:
+@guarded_tool(deadline=LONG_TOOL_DEADLINE_SECONDS)
+async def get_task_tree(
+    list_id: Optional[str] = None,
+    root_task_id: Optional[str] = None,
+    max_depth: int = 5,
+    max_nodes: int = 200
+) -> str:
     """
-    Get information about the currently authenticated ClickUp user.
+    Show the parent → subtask hierarchy of a list, or the full subtree of
+    one task, in a single call.
 
-    This tool returns the user's profile information including name, email,
-    workspace memberships, and account details.
+    All task pages of the list are fetched concurrently with subtasks
+    included, then the tree is rebuilt from each task's parent ID, so deep
+    hierarchies need no call per level.
 
-    Use this tool to:
-    - Verify authentication is working correctly
-    - Get the user's team (workspace) IDs for other operations
-    - Understand what workspaces the user has access to
+    Args:
+        list_id: The list ID. Optional when root_task_id is given
+                 (the task's own list is used). Example: "901200567890"
+        root_task_id: Show only this task and its descendants.
+                      Example: "86a1b2c3d"
+        max_depth: Levels to expand before summarizing as a count. Default: 5
+        max_nodes: Maximum number of tasks to render. Default: 200
 
     Returns:
-        Markdown formatted user information including workspaces
+        Indented Markdown tree with task name, ID, status and assignees
+
+    Use this tool to:
+    - Audit how work is broken down into subtasks
+    - Find deep or oversized task hierarchies
+    - See everything under an epic or parent task
 
     Example usage:
-        - "Show me my ClickUp profile"
-        - "What workspaces do I have access to?"
-        - "Get my team IDs"
+        - "Show the subtask tree of list X"
+        - "What is under task 86a1b2c3d?"
     """
     try:
-        data = await make_api_request("/user")
-        user = data.get("user", {})
-
-        output = f"# ClickUp User Profile\n\n"
-        output += f"**Name**: {user.get('username', 'N/A')}\n"
-        output += f"**Email**: {user.get('email', 'N/A')}\n"
-        output += f"**ID**: `{user.get('id')}`\n"
-        output += f"**Color**: {user.get('color', 'N/A')}\n\n"
+        if not list_id and not root_task_id:
+            return "Error: Provide list_id or root_task_id."
+
+        root_task = None
+        if not list_id:
+            root_task = await make_api_request(f"/task/{root_task_id}")
+            list_id = (root_task.get("list") or {}).get("id")
+            if not list_id:
+                return f"Error: Could not determine the list of task {root_task_id}."
+
+        tasks: list[dict] = []
+        incomplete = False
+
+        async def collect() -> None:
+            nonlocal incomplete
+            params = {"subtasks": "true", "include_closed": "true"}
+            try:
+                async for page_tasks in iter_task_pages(f"/list/{list_id}/task", params=params):
+                    tasks.extend(page_tasks)
+            except DeadlineExceeded:
+                if not tasks:
+                    raise
+                incomplete = True
+
+        # The root task is fetched alongside the pages (it may be closed or archived)
+        if root_task_id and root_task is None:
+            _, root_task = await asyncio.gather(
+                collect(), make_api_request(f"/task/{root_task_id}")
+            )
+        else:
+            await collect()
+
+        index, children = build_task_tree(tasks)
+        await member_directory.ensure()
+        if root_task_id:
+            index.setdefault(root_task_id, root_task)
+            roots = [root_task_id]
+        else:
+            # Top-level tasks plus subtasks whose parent is not in this list
+            roots = children.get(None, []) + [
+                task_id for parent, ids in children.items()
+                if parent is not None and parent not in index
+                for task_id in ids
+            ]
+
+        if not roots:
+            return f"No tasks found in list {list_id}"
 
-        # Workspaces (teams)
-        teams = data.get("user", {}).get("teams", [])
-        if teams:
-            output += f"## Workspaces ({len(teams)} total)\n\n"
-            for team in teams:
-                output += f"### {team.get('name', 'Unnamed Workspace')}\n"
-                output += f"- **ID**: `{team.get('id')}` (use this for get_spaces)\n"
-                output += f"- **Color**: {team.get('color', 'N/A')}\n"
-                output += f"- **Avatar**: {team.get('avatar', 'None')}\n\n"
+        total = sum(1 + count_descendants(task_id, children) for task_id in roots)
+        tree, rendered = render_task_tree(roots, index, children, max_depth, max_nodes)
+
+        output = incomplete_notice() if incomplete else ""
+        if root_task_id:
+            output += f"# Task Tree: {root_task.get('name', root_task_id)}\n\n"
+        else:
+            output += f"# Task Tree for List {list_id}\n\n"
+        output += f"**Tasks**: {total}"
+        if not root_task_id:
+            output += f" ({len(roots)} top-level, {len(tasks) - len(roots)} subtasks)"
+        output += "\n\n"
+        output += tree
+        if rendered < total:
+            output += f"\n*Showing {rendered} of {total} tasks; raise `max_depth` or `max_nodes`, or set `root_task_id`.*\n"
 
         return truncate_if_needed(output)
 
     except Exception as e:
-        return f"Error getting user information: {str(e)}"
+        return f"Error getting task tree: {str(e)}"
 
 
 @mcp.tool()
-async def get_spaces(team_id: str, archived: bool = False) -> str:
+@guarded_tool()
+async def get_views(
+    space_id: str,
+    include_nested: bool = True,
+    team_id: Optional[str] = None
+) -> str:
     """
-    Get all spaces in a ClickUp workspace (team).
+    Get all views (including dashboards) in a space.
 
-    Spaces are the top-level organizational containers in ClickUp, containing
-    folders, lists, and tasks. This tool returns an overview of all spaces
-    with their basic information and status configuration.
+    Views include Board, List, Calendar, Gantt, and Dashboard views.
+    This helps understand how the client visualizes and organizes their data.
+    Views saved on the space and on every folder and list inside it are
+    fetched concurrently and deduplicated.
 
     Args:
-        team_id: The workspace (team) ID. Get this from get_authorized_user tool.
-                 Example: "9012345678"
-        archived: Include archived spaces in results. Default: false
+        space_id: The space ID. Get from get_spaces tool.
+                  Example: "90120012345"
+        include_nested: Also collect folder- and list-level views. Default: true
+        team_id: Also collect workspace-level ("Everything") views for this
+                 workspace. Example: "9012345678"
 
     Returns:
-        Markdown formatted list of spaces with their IDs and key properties
+        Markdown formatted list of views with their types and configurations
 
     Use this tool to:
-    - Discover what spaces exist in a workspace
-    - Get space IDs for further exploration
-    - See space status configurations
+    - Discover existing dashboards and views
+    - Understand data visualization preferences
+    - Identify reporting patterns
+    - Plan dashboard improvements
 
     Example usage:
-        - "List all spaces in workspace 9012345678"
-        - "Show me the spaces including archived ones"
-        - "What spaces are in my workspace?"
+        - "What views exist in this space?"
+        - "Show me the dashboards"
+        - "List all views in Austin's workspace"
     """
     try:
-        params = {"archived": str(archived).lower()}
-        data = await make_api_request(f"/team/{team_id}/space", params=params)
-        spaces = data.get("spaces", [])
+        views, levels, failures = await crawl_views(space_id, team_id, include_nested)
+        if failures and len(failures) == sum(levels.values()):
+            raise failures[0]
 
-        return format_spaces_response(spaces)
+        if not views:
+            return "No views found in this space."
+
+        searched = "**Levels searched**: " + ", ".join(
+            f"{count} {level}{'s' if count > 1 else ''}" for level, count in levels.items()
+        )
+        if failures:
+            searched += f" ({len(failures)} failed)"
+
+        # The levels line goes right below the "# Views" heading
+        heading, _, body = (await worker_pool.render(format_views, views)).partition("\n\n")
+        output = incomplete_notice() if any(isinstance(e, DeadlineExceeded) for e in failures) else ""
+        output += f"{heading}\n\n{searched}\n\n{body}"
+        return truncate_if_needed(output)
 
     except Exception as e:
-        return f"Error getting spaces: {str(e)}"
+        return f"Error getting views: {str(e)}"
 
 
 @mcp.tool()
-async def get_space_details(space_id: str) -> str:
+@guarded_tool()
+async def get_view_tasks(view_id: str, page: int = 0, limit: int = 25) -> str:
     """
-    Get detailed information about a specific ClickUp space.
+    Get the tasks a view shows, with the view's own filters and sorting applied.
 
-    This tool returns comprehensive information about a space including:
-    - Basic space properties (name, privacy, archived status)
-    - All status configurations
-    - Folder structure with nested lists
-    - Folderless lists
+    Consecutive pages are fetched concurrently until `limit` tasks are
+    collected, so large views need one call instead of one per page.
 
     Args:
-        space_id: The space ID. Get this from get_spaces tool.
-                  Example: "90120012345"
+        view_id: The view ID. Get from get_views. Example: "3c-105"
+        page: First ClickUp page to read (0-indexed). Default: 0
+        limit: Stop after the page that reaches this many tasks (1-500). Default: 25
 
     Returns:
-        Markdown formatted detailed space information including folders and lists
+        Markdown formatted tasks with their lists and custom field values,
+        plus the page to continue from
 
     Use this tool to:
-    - Explore the structure of a specific space
-    - Find list IDs for getting custom fields
-    - Understand the organizational hierarchy
-    - See all available statuses in the space
+    - See exactly what a dashboard or board view displays
+    - Audit view filters against the tasks they surface
 
     Example usage:
-        - "Show me details for space 90120012345"
-        - "What folders and lists are in this space?"
-        - "Get the structure of space X"
+        - "What tasks are in the Sprint Board view?"
+        - "Show the next page of view 3c-105"
     """
     try:
-        data = await make_api_request(f"/space/{space_id}")
+        limit = max(1, min(limit, 500))
+
+        tasks: list[dict] = []
+        pages_read = 0
+        more = incomplete = False
+
+        async def collect() -> None:
+            nonlocal pages_read, more, incomplete
+            # View pages are smaller than list pages; request only the pages
+            # the limit can fill, so no fetched page goes unused
+            needed = (limit + VIEW_PAGE_SIZE - 1) // VIEW_PAGE_SIZE
+            pages = iter_task_pages(
+                f"/view/{view_id}/task", max_pages=needed, concurrency=min(PAGE_CONCURRENCY, needed),
+                start_page=page, page_size=VIEW_PAGE_SIZE
+            )
+            try:
+                async for page_tasks in pages:
+                    tasks.extend(page_tasks)
+                    pages_read += 1
+                    if len(tasks) >= limit:
+                        # A short page is the last one; only a full page may have more after it
+                        more = len(page_tasks) >= VIEW_PAGE_SIZE
+                        break
+            except DeadlineExceeded:
+                if not tasks:
+                    raise
+                incomplete = True
+            finally:
+                await pages.aclose()
+
+        # Fetch tasks, view info (for context) and member names concurrently
+        collected, view_data, _ = await asyncio.gather(
+            collect(), make_api_request(f"/view/{view_id}"), member_directory.ensure(),
+            return_exceptions=True
+        )
+        if isinstance(collected, BaseException):
+            raise collected
+        view = view_data.get("view", {}) if isinstance(view_data, dict) else {}
 
-        return format_space_details(data)
+        if not tasks:
+            return f"No tasks found in view {view_id}" + (f" from page {page}" if page else "")
+
+        output = incomplete_notice() if incomplete else ""
+        output += f"# Tasks in View: {view.get('name', view_id)}\n\n"
+        output += f"**Showing {len(tasks)} tasks** from pages {page}–{page + pages_read - 1}"
+        if more or incomplete:
+            output += f" (continue with `page={page + pages_read}`)"
+        output += "\n\n"
+
+        # Whole pages are shown so the continuation page skips nothing
+        output += await worker_pool.render(render_tasks, tasks, show_list=True)
+
+        return truncate_if_needed(output)
 
     except Exception as e:
-        return f"Error getting space details: {str(e)}"
+        return f"Error getting view tasks: {str(e)}"
 
 
 @mcp.tool()
-async def get_list_custom_fields(list_id: str) -> str:
+@guarded_tool()
+async def audit_custom_fields(space_id: str, archived: bool = False) -> str:
     """
-    Get all custom fields (columns) configured for a specific list.
+    Audit custom field consistency across every list in a space.
 
-    Custom fields are the columns you see in ClickUp lists. They can be various
-    types like text, number, dropdown, date, etc. This tool shows all custom
-    fields available on a list with their configuration.
+    Fetches custom fields for all lists concurrently, deduplicates field
+    definitions by ID and by configuration hash, and shows which lists each
+    field covers. Near-duplicate fields (same name with different IDs, or
+    separately created fields with identical configuration) are flagged.
 
     Args:
-        list_id: The list ID. Get this from get_space_details tool.
-                 Example: "901200567890"
+        space_id: The space ID. Get from get_spaces tool.
+                  Example: "90120012345"
+        archived: Include archived folders and lists. Default: false
 
     Returns:
-        Markdown formatted list of custom fields with types and configuration
-
-    Supported field types include:
-    - text, short_text (text inputs)
-    - number, currency (numeric values)
-    - drop_down, labels (selection fields)
-    - date (date picker)
-    - checkbox (boolean)
-    - email, phone, url (formatted text)
-    - users, tasks (relationship fields)
-    - And more...
+        Markdown formatted list legend, field coverage matrix, and
+        near-duplicate report
 
     Use this tool to:
-    - Discover what custom fields are available on a list
-    - Understand field types and configurations
-    - See field IDs for task operations
-    - Check if fields are required or hidden from guests
+    - Check custom field consistency across a space in one call
+    - Find fields missing from some lists
+    - Spot duplicated fields that should be merged
 
     Example usage:
-        - "What custom fields are on list 901200567890?"
-        - "Show me the columns for this list"
-        - "Get custom field configuration for list X"
+        - "Audit the custom fields in space 90120012345"
+        - "Which fields are not used consistently across lists?"
+        - "Find duplicate custom fields in this space"
     """
     try:
-        data = await make_api_request(f"/list/{list_id}/field")
-        fields = data.get("fields", [])
+        lists = await get_space_lists(space_id, archived=archived)
+
+        if not lists:
+            return "No lists found in this space."
 
-        return format_custom_fields(fields)
+        responses = await gather_with_concurrency(
+            make_api_request(f"/list/{lst.get('id')}/field") for lst in lists
+        )
+        list_fields = [
+            r if isinstance(r, BaseException) else r.get("fields", [])
+            for r in responses
+        ]
+
+        output = format_custom_field_audit(space_id, lists, list_fields)
+        if any(isinstance(r, DeadlineExceeded) for r in responses):
+            output = incomplete_notice() + output
+        return output
 
     except Exception as e:
-        return f"Error getting custom fields: {str(e)}"
+        return f"Error auditing custom fields: {str(e)}"
 
 
 @mcp.tool()
-async def get_folderless_lists(space_id: str, archived: bool = False) -> str:
+@guarded_tool()
+async def query_tasks(
+    team_id: str,
+    statuses: Optional[list[str]] = None,
+    assignees: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+    space_ids: Optional[list[str]] = None,
+    list_ids: Optional[list[str]] = None,
+    due_date_gt: Optional[str] = None,
+    due_date_lt: Optional[str] = None,
+    date_updated_gt: Optional[str] = None,
+    overdue: bool = False,
+    include_closed: bool = False,
+    limit: int = 25
+) -> str:
     """
-    Get all lists that are not inside folders in a space.
+    Query tasks across a whole workspace with server-side filters.
 
-    In ClickUp, lists can exist directly in a space without being inside a folder.
-    This tool returns those "folderless" lists with their basic information.
+    Uses ClickUp's filtered team task endpoint, so questions like "all overdue
+    tasks assigned to X" take a few paged queries instead of a crawl of every
+    list. Pages are fetched concurrently and fetching stops once `limit`
+    tasks have been collected.
 
     Args:
-        space_id: The space ID. Get this from get_spaces tool.
-                  Example: "90120012345"
-        archived: Include archived lists in results. Default: false
+        team_id: The workspace (team) ID. Get from get_authorized_user tool.
+                 Example: "9012345678"
+        statuses: Only tasks in these statuses. Example: ["in progress", "review"]
+        assignees: Only tasks assigned to these user IDs. Example: ["183"]
+        tags: Only tasks with these tags. Example: ["urgent"]
+        space_ids: Restrict to these spaces
+        list_ids: Restrict to these lists
+        due_date_gt: Due after this date (YYYY-MM-DD or Unix ms)
+        due_date_lt: Due before this date (YYYY-MM-DD or Unix ms)
+        date_updated_gt: Updated after this date (YYYY-MM-DD or Unix ms)
+        overdue: Only open tasks whose due date has passed. Default: false
+        include_closed: Include closed tasks. Default: false
+        limit: Maximum number of tasks to return (1-500). Default: 25
 
     Returns:
-        Markdown formatted list of folderless lists with their IDs
+        Markdown formatted matching tasks with their lists and custom field values
 
     Use this tool to:
-    - Find lists at the space level
-    - Get list IDs for viewing custom fields
-    - Discover lists not organized in folders
+    - Find overdue or stale tasks across the workspace
+    - See everything assigned to a person in one call
+    - Filter by status, tag, or update date across spaces and lists
 
     Example usage:
-        - "Show folderless lists in space 90120012345"
-        - "What lists are directly in this space?"
-        - "Get lists not in any folder"
+        - "Show all overdue tasks assigned to user 183"
+        - "Which tasks tagged urgent haven't been updated since March?"
+        - "List tasks in review across spaces X and Y"
     """
     try:
-        params = {"archived": str(archived).lower()}
-        data = await make_api_request(f"/space/{space_id}/list", params=params)
-        lists = data.get("lists", [])
-
-        if not lists:
-            return "No folderless lists found in this space."
+        limit = max(1, min(limit, 500))
 
-        output = f"# Folderless Lists ({len(lists)} total)\n\n"
+        params: dict[str, Any] = {
+            "order_by": "due_date" if overdue else "updated",
+            "reverse": "true",
+            "subtasks": "true",
+            "include_closed": str(include_closed and not overdue).lower(),
+            **task_filter_params(statuses, assignees, tags, space_ids, list_ids)
+        }
 
-        for lst in lists:
-            output += f"## {lst.get('name', 'Unnamed List')}\n"
-            output += f"- **ID**: `{lst.get('id')}` (use with get_list_custom_fields)\n"
-            output += f"- **Archived**: {lst.get('archived', False)}\n"
-            output += f"- **Task Count**: {lst.get('task_count', 0)}\n"
+        if overdue:
+            now_ms = int(time.time() * 1000)
+            due_lt = parse_date_ms(due_date_lt)
+            due_date_lt = str(min(due_lt, now_ms) if due_lt else now_ms)
+
+        for key, value in (
+            ("due_date_gt", due_date_gt),
+            ("due_date_lt", due_date_lt),
+            ("date_updated_gt", date_updated_gt)
+        ):
+            timestamp = parse_date_ms(value)
+            if timestamp is not None:
+                params[key] = timestamp
+
+        tasks: list[dict] = []
+        incomplete = False
+        max_pages = -(-limit // TASK_PAGE_SIZE)
+        pages = iter_task_pages(f"/team/{team_id}/task", params=params, max_pages=max_pages)
+        try:
+            async for page_tasks in pages:
+                tasks.extend(page_tasks)
+                if len(tasks) >= limit:
+                    break
+        except DeadlineExceeded:
+            if not tasks:
+                raise
+            incomplete = True
+        finally:
+            await pages.aclose()
 
-            if 'status' in lst:
-                status = lst['status']
-                output += f"- **Status**: {status.get('status', 'N/A')}\n"
+        if not tasks:
+            return "No tasks match these filters."
+        await member_directory.ensure()
 
-            output += "\n"
+        more = len(tasks) > limit or len(tasks) == max_pages * TASK_PAGE_SIZE
+        output = incomplete_notice() if incomplete else ""
+        output += "# Task Query Results\n\n"
+        output += f"**Showing {min(limit, len(tasks))} tasks**"
+        output += " (more match; raise `limit` or narrow the filters)\n\n" if more else "\n\n"
+
+        output += await worker_pool.render(render_tasks, tasks[:limit], show_list=True)
 
         return truncate_if_needed(output)
 
     except Exception as e:
-        return f"Error getting folderless lists: {str(e)}"
+        return f"Error querying tasks: {str(e)}"
 
 
 @mcp.tool()
-async def get_folders(space_id: str, archived: bool = False) -> str:
+@guarded_tool(deadline=LONG_TOOL_DEADLINE_SECONDS)
+async def bulk_update_tasks(
+    task_ids: list[str],
+    status: Optional[str] = None,
+    priority: Optional[int] = None,
+    add_assignees: Optional[list[int]] = None,
+    remove_assignees: Optional[list[int]] = None,
+    custom_field_id: Optional[str] = None,
+    custom_field_value: Optional[Any] = None,
+    dry_run: bool = True,
+    idempotency_key: Optional[str] = None
+) -> str:
     """
-    Get all folders in a ClickUp space with their lists.
+    Apply the same change to many tasks at once (status, priority, assignees,
+    or a custom field value).
 
-    This is the KEY tool for auditing workspace structure. Returns complete
-    folder hierarchy with all lists, task counts, and IDs needed for deeper analysis.
+    Updates run concurrently through a rate-limit-aware executor: 429 responses
+    pause all requests until ClickUp's reset time, and transient failures are
+    retried. Every task gets its own result, so partial failures are reported
+    instead of aborting the batch.
+
+    IMPORTANT: This tool modifies data. It defaults to dry_run=true, which only
+    shows the planned requests. Run it again with dry_run=false to apply.
 
     Args:
-        space_id: The space ID. Get this from get_spaces tool.
-                  Example: "90120012345"
-        archived: Include archived folders. Default: false
+        task_ids: Task IDs to update (up to 1000). Duplicates are ignored.
+        status: New status name. Example: "complete"
+        priority: New priority: 1 (urgent), 2 (high), 3 (normal), 4 (low)
+        add_assignees: User IDs to add as assignees
+        remove_assignees: User IDs to remove from assignees
+        custom_field_id: Custom field to set (get IDs from get_list_custom_fields)
+        custom_field_value: Value for the custom field (option ID for dropdowns)
+        dry_run: Only show what would change. Default: true
+        idempotency_key: Any string naming this batch. Re-running with the same
+                         key and the same changes skips tasks that were
+                         already updated, so a failed batch can be retried safely.
 
     Returns:
-        Markdown formatted folder structure with lists and task counts
+        Markdown summary with per-task failures and counts
 
     Use this tool to:
-    - Audit complete workspace structure
-    - Find all lists organized in folders
-    - Get list IDs for custom field analysis
-    - See task distribution across lists
-    - Identify organizational patterns
+    - Apply cleanup recommendations from an audit
+    - Move many tasks to a new status
+    - Reassign or reprioritize tasks in bulk
+    - Fill in a custom field across many tasks
 
     Example usage:
-        - "Show me all folders in space X"
-        - "Audit the structure of Austin's workspace"
-        - "What lists exist in this space?"
+        - "Set priority to high on these 200 tasks"
+        - "Move all these tasks to 'archived'"
+        - "Set the Region field to EMEA on these tasks"
     """
     try:
-        params = {"archived": str(archived).lower()}
-        data = await make_api_request(f"/space/{space_id}/folder", params=params)
-        folders = data.get("folders", [])
+        task_ids = list(dict.fromkeys(t.strip() for t in task_ids if t and t.strip()))
+        if not task_ids:
+            return "Error: No task IDs provided."
+        if len(task_ids) > BULK_MAX_TASKS:
+            return f"Error: Too many tasks ({len(task_ids)}). Maximum is {BULK_MAX_TASKS} per call."
+        if priority is not None and priority not in (1, 2, 3, 4):
+            return "Error: priority must be 1 (urgent), 2 (high), 3 (normal), or 4 (low)."
+
+        task_update: dict[str, Any] = {}
+        if status:
+            task_update["status"] = status
+        if priority is not None:
+            task_update["priority"] = priority
+        if add_assignees or remove_assignees:
+            task_update["assignees"] = {
+                "add": add_assignees or [],
+                "rem": remove_assignees or []
+            }
+        set_field = custom_field_id is not None
+        if set_field and custom_field_value is None:
+            return "Error: custom_field_value is required when custom_field_id is set."
+
+        if not task_update and not set_field:
+            return "Error: No changes specified."
+
+        # A key reused with different changes starts over instead of skipping tasks
+        done_key = (idempotency_key, payload_hash([task_update, custom_field_id, custom_field_value]))
+        if idempotency_key and done_key not in completed_bulk_updates:
+            if len(completed_bulk_updates) >= BULK_IDEMPOTENCY_KEYS:
+                completed_bulk_updates.pop(next(iter(completed_bulk_updates)))
+        done = completed_bulk_updates.setdefault(done_key, set()) if idempotency_key else set()
+        pending = [task_id for task_id in task_ids if task_id not in done]
+        skipped = len(task_ids) - len(pending)
+
+        planned = []
+        if task_update:
+            planned.append(f"`PUT /task/{{task_id}}` with `{json.dumps(task_update)}`")
+        if set_field:
+            planned.append(
+                f"`POST /task/{{task_id}}/field/{custom_field_id}` with "
+                f"`{json.dumps({'value': custom_field_value}, default=str)}`"
+            )
 
-        if not folders:
-            return "No folders found in this space."
+        if dry_run:
+            output = "# Bulk Update (dry run)\n\n"
+            output += f"**Tasks to update**: {len(pending)}\n"
+            if skipped:
+                output += f"**Already done under this idempotency key**: {skipped}\n"
+            output += "\n**Requests per task**:\n"
+            for request in planned:
+                output += f"- {request}\n"
+            output += "\nRun again with `dry_run=false` to apply these changes.\n"
+            return output
+
+        async def update(task_id: str) -> None:
+            if task_update:
+                await make_api_request(f"/task/{task_id}", method="PUT", json_data=task_update)
+            if set_field:
+                await make_api_request(
+                    f"/task/{task_id}/field/{custom_field_id}",
+                    method="POST",
+                    json_data={"value": custom_field_value}
+                )
+            done.add(task_id)
+
+        started = time.monotonic()
+        results = await run_bulk_operations(pending, update)
+        elapsed = time.monotonic() - started
+
+        failed = {task_id: error for task_id, error in results.items() if error}
+        succeeded = len(results) - len(failed)
+
+        output = incomplete_notice() if deadline_passed() else ""
+        output += "# Bulk Update Results\n\n"
+        output += f"**Updated**: {succeeded}\n"
+        output += f"**Failed**: {len(failed)}\n"
+        if skipped:
+            output += f"**Skipped (already done)**: {skipped}\n"
+        output += f"**Elapsed**: {elapsed:.1f}s\n\n"
+
+        if failed:
+            output += f"## Failures ({len(failed)})\n\n"
+            for task_id, error in failed.items():
+                output += f"- `{task_id}`: {error}\n"
+            output += "\n"
+            if idempotency_key:
+                output += "Re-run with the same `idempotency_key` to retry only the failed tasks.\n"
 
-        output = f"# Folders ({len(folders)} total)\n\n"
+        return truncate_if_needed(output)
 
-        total_lists = 0
-        total_tasks = 0
+    except Exception as e:
+        return f"Error running bulk update: {str(e)}"
 
-        for folder in folders:
-            folder_name = folder.get('name', 'Unnamed Folder')
-            folder_id = folder.get('id')
-            hidden = folder.get('hidden', False)
 
-            output += f"## 📁 {folder_name}\n"
-            output += f"- **Folder ID**: `{folder_id}`\n"
-            output += f"- **Hidden**: {hidden}\n"
+@mcp.tool()
+@guarded_tool(deadline=LONG_TOOL_DEADLINE_SECONDS)
+async def import_tasks(
+    list_id: str,
+    file_path: str,
+    file_format: Optional[str] = None,
+    name_column: str = "name",
+    checkpoint_path: Optional[str] = None,
+    dry_run: bool = True
+) -> str:
+    """
+    Create tasks in a list from a local CSV or NDJSON file.
 
-            lists = folder.get('lists', [])
-            if lists:
-                output += f"- **Lists**: {len(lists)}\n\n"
-                for lst in lists:
-                    list_name = lst.get('name', 'Unnamed List')
-                    list_id = lst.get('id')
-                    task_count = lst.get('task_count', 0)
+    Rows are streamed from disk, so files with thousands of rows use constant
+    memory. Columns are matched to custom fields by field name or ID using the
+    list's field definitions; dropdown and label values may be given as
+    option names. Tasks are created with bounded concurrency through the
+    shared rate limiter.
 
-                    total_lists += 1
-                    total_tasks += task_count
+    Progress is appended to a checkpoint file after every created task,
+    keyed by target list and row content. Re-running the same import skips
+    rows that were already created, so an interrupted import resumes without
+    duplicates, even if other rows were edited, added or removed meanwhile.
 
-                    output += f"   📋 **{list_name}**\n"
-                    output += f"      - List ID: `{list_id}`\n"
-                    output += f"      - Tasks: {task_count}\n"
-                    output += f"      - Archived: {lst.get('archived', False)}\n"
+    IMPORTANT: This tool creates tasks. It defaults to dry_run=true, which
+    validates every row and previews the first payloads without writing.
 
-                    if 'folder' in lst:
-                        output += f"      - Folder: {lst['folder'].get('name', 'N/A')}\n"
-                    output += "\n"
-            else:
-                output += "- **Lists**: None\n\n"
+    Args:
+        list_id: The list to create tasks in. Example: "901200567890"
+        file_path: Path to a .csv or .ndjson/.jsonl file on the server
+                   (relative to CLICKUP_IMPORT_DIR when it is set)
+        file_format: "csv" or "ndjson". Default: detected from the extension
+        name_column: Column holding the task name. Default: "name"
+        checkpoint_path: Checkpoint file. Default: <file_path>.checkpoint
+        dry_run: Validate and preview only. Default: true
+
+    Standard columns: name, description, markdown_description, status,
+    priority (1-4 or urgent/high/normal/low), due_date, start_date
+    (YYYY-MM-DD or Unix ms), assignees (comma-separated user IDs), tags
+    (comma-separated). Any other column must match a custom field.
 
-        output += f"\n---\n**Summary**: {len(folders)} folders, {total_lists} lists, {total_tasks} total tasks\n"
+    Returns:
+        Markdown summary of created, skipped, and failed rows
+
+    Example usage:
+        - "Import /data/leads.csv into list 901200567890"
+        - "Resume the import of clients.ndjson"
+    """
+    try:
+        if file_format is None:
+            file_format = "csv" if file_path.lower().endswith(".csv") else "ndjson"
+        file_format = file_format.lower()
+        if file_format not in ("csv", "ndjson"):
+            return "Error: file_format must be 'csv' or 'ndjson'."
+        file_path = resolve_data_path(file_path, IMPORT_DIR, "CLICKUP_IMPORT_DIR")
+        checkpoint_path = resolve_data_path(
+            checkpoint_path or f"{file_path}.checkpoint", IMPORT_DIR, "CLICKUP_IMPORT_DIR"
+        )
+        if not os.path.exists(file_path):
+            return f"Error: File not found: {file_path}"
+
+        completed = load_checkpoint(checkpoint_path)
+
+        fields_data = await make_api_request(f"/list/{list_id}/field")
+        converters: dict[str, tuple[str, Callable[[Any], Any]]] = {}
+        for field in fields_data.get("fields", []):
+            convert = build_field_converter(field)
+            converters[str(field.get("id")).lower()] = (field.get("id"), convert)
+            converters[field.get("name", "").strip().lower()] = (field.get("id"), convert)
+
+        created = skipped = failed_rows = 0
+        failures: list[tuple[int, str]] = []
+        unmapped: Optional[set[str]] = None
+        previews: list[dict] = []
+        started = time.monotonic()
+
+        def note_failure(row_number: int, error: str) -> None:
+            nonlocal failed_rows
+            failed_rows += 1
+            if len(failures) < 50:
+                failures.append((row_number, error))
+
+        # A dry run writes nothing, not even an empty checkpoint file
+        checkpoint_file = nullcontext() if dry_run else open(checkpoint_path, "a", encoding="utf-8")
+        with checkpoint_file as checkpoint:
+            async def create_window(window: dict[str, tuple[int, dict]]) -> None:
+                async def create(row_key: str) -> None:
+                    nonlocal created
+                    data = await make_api_request(
+                        f"/list/{list_id}/task", method="POST", json_data=window[row_key][1]
+                    )
+                    checkpoint.write(f"{row_key}\t{data.get('id', '')}\n")
+                    checkpoint.flush()
+                    created += 1
+
+                results = await run_bulk_operations(list(window), create, idempotent=False)
+                for row_key, error in results.items():
+                    if error:
+                        note_failure(window[row_key][0], error)
+
+            window: dict[str, tuple[int, dict]] = {}
+            seen: dict[str, int] = {}
+            for row_number, row in iter_import_rows(file_path, file_format):
+                if isinstance(row, ValueError):
+                    note_failure(row_number, str(row))
+                    continue
+                row_key = import_row_key(list_id, row, seen)
+                if row_key in completed:
+                    skipped += 1
+                    continue
+
+                if unmapped is None:
+                    unmapped = {
+                        column for column in row
+                        if column and column.strip().lower() not in IMPORT_TASK_COLUMNS
+                        and column != name_column
+                        and column.strip().lower() not in converters
+                    }
+
+                try:
+                    payload = build_task_payload(row, name_column, converters)
+                except (ValueError, TypeError) as e:
+                    note_failure(row_number, str(e))
+                    continue
+
+                if dry_run:
+                    if len(previews) < 3:
+                        previews.append(payload)
+                    created += 1
+                    continue
+
+                window[row_key] = (row_number, payload)
+                if len(window) >= IMPORT_WINDOW:
+                    await create_window(window)
+                    window = {}
+                    if deadline_passed():
+                        break
+
+            if window and not deadline_passed():
+                await create_window(window)
+
+        elapsed = time.monotonic() - started
+        title = "Import Preview (dry run)" if dry_run else "Import Results"
+
+        output = ""
+        if deadline_passed():
+            output += incomplete_notice()
+            output += "Run the same import again to continue from the checkpoint.\n\n"
+        output += f"# {title}\n\n"
+        output += f"**Rows {'valid' if dry_run else 'created'}**: {created}\n"
+        output += f"**Rows skipped (already imported)**: {skipped}\n"
+        output += f"**Rows failed**: {failed_rows}\n"
+        output += f"**Checkpoint**: `{checkpoint_path}`\n"
+        output += f"**Elapsed**: {elapsed:.1f}s\n\n"
+
+        if unmapped:
+            output += "## Ignored Columns\n\n"
+            output += "These columns match no task property or custom field on this list:\n"
+            for column in sorted(unmapped):
+                output += f"- {column}\n"
+            output += "\n"
+
+        if previews:
+            output += "## Sample Payloads\n\n"
+            for payload in previews:
+                output += f"```json\n{json.dumps(payload, indent=2, default=str)}\n```\n"
+            output += "\nRun again with `dry_run=false` to create these tasks.\n\n"
+
+        if failures:
+            output += "## Failed Rows\n\n"
+            for row_number, error in failures:
+                output += f"- Row {row_number}: {error}\n"
+            if not dry_run:
+                output += "\nFix the rows and run the import again; created rows are skipped.\n"
 
         return truncate_if_needed(output)
 
     except Exception as e:
-        return f"Error getting folders: {str(e)}"
+        return f"Error importing tasks: {str(e)}"
 
 
 @mcp.tool()
-async def get_list_details(list_id: str) -> str:
+@guarded_tool(deadline=LONG_TOOL_DEADLINE_SECONDS)
+async def export_tasks(
+    scope: str,
+    target_id: str,
+    output_dir: str,
+    file_format: str = "ndjson",
+    include_closed: bool = True,
+    include_subtasks: bool = True,
+    archived: bool = False
+) -> str:
     """
-    Get detailed information about a specific list including all custom fields.
+    Export every task in a list, space, or whole workspace to files on disk.
 
-    This tool provides comprehensive list analysis including structure, fields,
-    statuses, and configuration - essential for workflow audit.
+    Walks the hierarchy, then streams each list's tasks (custom fields
+    flattened into `cf:<field name>` columns) straight to one NDJSON or CSV
+    file per list. Lists are exported concurrently with paged requests, and
+    only one page per list is held in memory.
+
+    Each finished list is recorded in `<output_dir>/export.checkpoint`.
+    Re-running the same export skips finished lists, so a large export can
+    resume after a crash or rate-limit pause.
 
     Args:
-        list_id: The list ID. Get this from get_folders or get_space_details.
-                 Example: "901200567890"
+        scope: What to export: "list", "space", or "team"
+        target_id: The list, space, or team ID matching the scope
+        output_dir: Directory on the server to write files into (created if
+                    missing; relative to CLICKUP_EXPORT_DIR when it is set)
+        file_format: "ndjson" or "csv". Default: "ndjson"
+        include_closed: Include closed tasks. Default: true
+        include_subtasks: Include subtasks. Default: true
+        archived: Include archived folders and lists. Default: false
 
     Returns:
-        Markdown formatted detailed list information with custom fields
-
-    Use this tool to:
-    - Audit list configuration and custom fields
-    - Understand data structure for each list
-    - See available statuses and priorities
-    - Check assignees and permissions
-    - Prepare for automation recommendations
+        Markdown summary of exported lists, task counts, and failures
 
     Example usage:
-        - "Show me details for Lead Tracker list"
-        - "What fields are in list 901111375515?"
-        - "Audit the structure of this list"
+        - "Export all tasks in space 90120012345 to /data/export as CSV"
+        - "Dump the whole workspace to NDJSON"
+        - "Resume the export in /data/export"
     """
     try:
-        data = await make_api_request(f"/list/{list_id}")
+        scope = scope.lower()
+        file_format = file_format.lower()
+        if scope not in ("list", "space", "team"):
+            return "Error: scope must be 'list', 'space', or 'team'."
+        if file_format not in ("ndjson", "csv"):
+            return "Error: file_format must be 'ndjson' or 'csv'."
+        output_dir = resolve_data_path(output_dir, EXPORT_DIR, "CLICKUP_EXPORT_DIR")
+
+        if scope == "list":
+            lists = [await make_api_request(f"/list/{target_id}")]
+        elif scope == "space":
+            lists = await get_space_lists(target_id, archived=archived)
+        else:
+            params = {"archived": str(archived).lower()}
+            spaces_data = await make_api_request(f"/team/{target_id}/space", params=params)
+            space_lists = await gather_with_concurrency(
+                get_space_lists(space.get("id"), archived=archived)
+                for space in spaces_data.get("spaces", [])
+            )
+            lists = []
+            for result in space_lists:
+                if isinstance(result, BaseException):
+                    raise result
+                lists.extend(result)
+
+        os.makedirs(output_dir, exist_ok=True)
+        checkpoint_path = os.path.join(output_dir, "export.checkpoint")
+        completed = load_checkpoint(checkpoint_path)
+        pending = [lst for lst in lists if str(lst.get("id")) not in completed]
+        await member_directory.ensure()
 
-        output = f"# List: {data.get('name', 'Unnamed')}\n\n"
-        output += f"**ID**: `{data.get('id')}`\n"
-        output += f"**Archived**: {data.get('archived', False)}\n"
-        output += f"**Task Count**: {data.get('task_count', 0)}\n"
+        params = {
+            "include_closed": str(include_closed).lower(),
+            "subtasks": str(include_subtasks).lower(),
+            "archived": str(archived).lower(),
+            "order_by": "created"
+        }
 
-        # Folder context
-        if 'folder' in data:
-            folder = data['folder']
-            output += f"**Folder**: {folder.get('name')} (ID: `{folder.get('id')}`)\n"
+        started = time.monotonic()
+        exported = 0
+        failures = []
 
-        # Space context
-        if 'space' in data:
-            space = data['space']
-            output += f"**Space**: {space.get('name')} (ID: `{space.get('id')}`)\n"
+        with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+            async def export(lst: dict) -> None:
+                nonlocal exported
+                count = await export_list_tasks(lst, output_dir, file_format, params)
+                checkpoint.write(f"{lst.get('id')}\t{count}\n")
+                checkpoint.flush()
+                exported += count
 
+            results = await gather_with_concurrency(
+                (export(lst) for lst in pending), limit=EXPORT_LIST_CONCURRENCY
+            )
+            for lst, result in zip(pending, results):
+                if isinstance(result, BaseException):
+                    failures.append((lst, result))
+
+        elapsed = time.monotonic() - started
+        previous = sum(int(count or 0) for count in completed.values())
+
+        output = ""
+        if any(isinstance(error, DeadlineExceeded) for _, error in failures):
+            output += incomplete_notice()
+        output += "# Task Export\n\n"
+        output += f"**Directory**: `{output_dir}`\n"
+        output += f"**Format**: {file_format}\n"
+        output += f"**Lists exported**: {len(pending) - len(failures)} of {len(lists)}"
+        if completed:
+            output += f" ({len(lists) - len(pending)} already done in a previous run)"
         output += "\n"
+        output += f"**Tasks written**: {exported}"
+        if previous:
+            output += f" (plus {previous} from previous runs)"
+        output += "\n"
+        output += f"**Elapsed**: {elapsed:.1f}s\n\n"
 
-        # Statuses
-        if 'statuses' in data:
-            statuses = data['statuses']
-            output += f"## Statuses ({len(statuses)} total)\n\n"
-            for status in statuses:
-                status_name = status.get('status', 'Unknown')
-                status_type = status.get('type', 'N/A')
-                color = status.get('color', 'N/A')
-                output += f"- **{status_name}** (Type: {status_type}, Color: {color})\n"
-            output += "\n"
-
-        # Priority
-        if 'priority' in data:
-            priority = data['priority']
-            if priority:
-                output += f"## Priority\n\n"
-                output += f"**Enabled**: {priority.get('enabled', False)}\n"
-                if 'priorities' in priority:
-                    for p in priority['priorities']:
-                        output += f"- {p.get('priority')} (Color: {p.get('color')})\n"
-                output += "\n"
-
-        # Due dates
-        if 'due_date_time' in data:
-            output += f"**Due Dates**: {data.get('due_date_time', False)}\n"
-
-        # Assignees
-        if 'assignees' in data:
-            assignees = data['assignees']
-            if assignees:
-                output += f"\n## Assignees ({len(assignees)} total)\n\n"
-                for assignee in assignees:
-                    output += f"- {assignee.get('username', 'N/A')} (ID: {assignee.get('id')})\n"
-                output += "\n"
-
-        # Get custom fields for this list
-        try:
-            fields_data = await make_api_request(f"/list/{list_id}/field")
-            fields = fields_data.get("fields", [])
-
-            if fields:
-                output += f"## Custom Fields ({len(fields)} total)\n\n"
-                for field in fields:
-                    output += f"### {field.get('name', 'Unnamed')}\n"
-                    output += f"- **ID**: `{field.get('id')}`\n"
-                    output += f"- **Type**: {field.get('type', 'unknown')}\n"
-                    output += f"- **Required**: {field.get('required', False)}\n"
-
-                    # Type-specific config
-                    type_config = field.get('type_config', {})
-                    if type_config:
-                        output += "- **Config**:\n"
-                        for key, value in list(type_config.items())[:5]:  # Limit config details
-                            output += f"  - {key}: {value}\n"
-                    output += "\n"
-        except Exception:
-            output += "\n*Custom fields: Unable to retrieve*\n"
+        if failures:
+            output += f"## Failed Lists ({len(failures)})\n\n"
+            for lst, error in failures:
+                output += f"- {lst.get('name', 'Unnamed List')} (`{lst.get('id')}`): {error}\n"
+            output += "\nRun the same export again to retry only the failed lists.\n"
 
         return truncate_if_needed(output)
 
     except Exception as e:
-        return f"Error getting list details: {str(e)}"
+        return f"Error exporting tasks: {str(e)}"
 
 
 @mcp.tool()
-async def get_tasks(list_id: str, page: int = 0, limit: int = 10) -> str:
+@guarded_tool()
+async def diff_workspace(space_id: str, save_snapshot: bool = True) -> str:
     """
-    Get sample tasks from a list to understand data structure and usage patterns.
+    Show what changed in a space since the last snapshot.
 
-    Use this to see real examples of how the list is being used, what data
-    is being tracked, and how custom fields are filled out.
+    Builds a content-hashed snapshot of the space hierarchy (one hash per
+    space, folder, list, and custom field set) and compares it with the
+    previous snapshot stored on disk. Unchanged subtrees are skipped by hash,
+    so the result is a compact change set: new or removed folders, lists and
+    fields, renames, status changes, and field configuration changes.
+
+    The first run for a space saves a baseline snapshot.
 
     Args:
-        list_id: The list ID. Get from get_folders or get_list_details.
-                 Example: "901200567890"
-        page: Page number for pagination (0-indexed). Default: 0
-        limit: Number of tasks to return (1-100). Default: 10
+        space_id: The space ID. Get from get_spaces tool.
+                  Example: "90120012345"
+        save_snapshot: Replace the stored snapshot with the current state
+                       after comparing. Default: true
 
     Returns:
-        Markdown formatted task information with custom field values
+        Markdown formatted change set since the previous snapshot
 
     Use this tool to:
-    - See real data examples from lists
-    - Understand how custom fields are used
-    - Analyze data quality and completeness
-    - Identify patterns for automation
-    - Get insights for recommendations
+    - Re-audit a client workspace and see what changed since last month
+    - Verify that a planned cleanup was applied
+    - Detect unexpected structure changes
 
     Example usage:
-        - "Show me sample tasks from Lead Tracker"
-        - "What data is in the first 5 tasks of this list?"
-        - "Analyze task structure in list X"
+        - "What changed in space 90120012345 since the last audit?"
+        - "Diff this space against the previous snapshot"
     """
     try:
-        params = {
-            "page": page,
-            "order_by": "created",
-            "reverse": "true",
-            "subtasks": "false",
-            "include_closed": "true"
-        }
+        # The ID becomes part of a file name, so it must not carry a path
+        if not space_id.isascii() or not space_id.isalnum():
+            return f"Error: Invalid space ID: {space_id}"
+        snapshot_path = os.path.join(SNAPSHOT_DIR, f"space_{space_id}.json")
+        current = await build_space_snapshot(space_id)
+        taken_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+        previous = None
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding="utf-8") as f:
+                previous = json.load(f)
+
+        if save_snapshot:
+            os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+            with open(snapshot_path, "w", encoding="utf-8") as f:
+                json.dump({"taken_at": taken_at, "tree": current}, f)
+
+        name = current["attrs"].get("name") or space_id
+        if previous is None:
+            output = f"# Workspace Snapshot: {name}\n\n"
+            output += f"No previous snapshot for space `{space_id}`.\n"
+            if save_snapshot:
+                output += f"Baseline saved ({current['size']} nodes). Run again later to see changes.\n"
+            return output
+
+        changes, skipped = diff_snapshots(previous["tree"], current)
+
+        output = f"# Workspace Diff: {name}\n\n"
+        output += f"**Compared with snapshot from**: {previous.get('taken_at', 'unknown')}\n"
+        output += f"**Nodes**: {current['size']} ({skipped} in unchanged subtrees, skipped)\n\n"
+
+        if not changes:
+            output += "No changes.\n"
+        else:
+            output += f"## Changes ({len(changes)})\n\n"
+            output += "\n".join(changes) + "\n"
 
-        data = await make_api_request(f"/list/{list_id}/task", params=params)
-        tasks = data.get("tasks", [])
+        return truncate_if_needed(output)
 
-        if not tasks:
-            return f"No tasks found in list {list_id}"
+    except Exception as e:
+        return f"Error diffing workspace: {str(e)}"
 
-        # Get list info for context
-        list_data = await make_api_request(f"/list/{list_id}")
-        list_name = list_data.get('name', 'Unknown List')
 
-        output = f"# Tasks from: {list_name}\n\n"
-        output += f"**Showing {min(limit, len(tasks))} of {len(tasks)} tasks**\n\n"
+@mcp.tool()
+@guarded_tool(admission=False)
+async def get_server_status() -> str:
+    """
+    Get the MCP server's own health: circuit breakers, rate limiter, request
+    hedging and cache statistics.
+
+    Use this tool to:
+    - Check whether the server is failing fast because ClickUp is having problems
+    - See how much rate-limit budget is left
+    - Diagnose slow or failing tool calls
+
+    Returns:
+        Markdown formatted server status
 
-        for i, task in enumerate(tasks[:limit], 1):
-            task_name = task.get('name', 'Unnamed Task')
-            task_id = task.get('id')
-            status = task.get('status', {}).get('status', 'No Status')
+    Example usage:
+        - "Is the ClickUp server healthy?"
+        - "Why are ClickUp requests failing?"
+    """
+    try:
+        return format_server_status(server_status())
 
-            output += f"## {i}. {task_name}\n"
-            output += f"- **Task ID**: `{task_id}`\n"
-            output += f"- **Status**: {status}\n"
-            output += f"- **Created**: {task.get('date_created', 'N/A')}\n"
+    except Exception as e:
+        return f"Error getting server status: {str(e)}"
 
-            # Priority
-            if 'priority' in task and task['priority']:
-                priority = task['priority']
-                output += f"- **Priority**: {priority.get('priority', 'N/A')}\n"
 
-            # Due date
-            if 'due_date' in task and task['due_date']:
-                output += f"- **Due Date**: {task['due_date']}\n"
+@mcp.tool()
+@guarded_tool(deadline=LONG_TOOL_DEADLINE_SECONDS)
+async def task_analytics(
+    metric: str,
+    group_by: str = "none",
+    list_ids: Optional[list[str]] = None,
+    space_id: Optional[str] = None,
+    field_name: Optional[str] = None,
+    include_closed: bool = True
+) -> str:
+    """
+    Compute task statistics over whole lists or spaces: counts, cycle times,
+    ages, overdue days, or the distribution of a numeric custom field,
+    grouped by status, assignee, list, week, or a dropdown field.
 
-            # Assignees
-            assignees = task.get('assignees', [])
-            if assignees:
-                assignee_names = [a.get('username', 'N/A') for a in assignees[:3]]
-                output += f"- **Assignees**: {', '.join(assignee_names)}\n"
-
-            # Custom fields with values
-            custom_fields = task.get('custom_fields', [])
-            if custom_fields:
-                output += "- **Custom Fields**:\n"
-                for field in custom_fields[:5]:  # Limit to 5 fields per task
-                    field_name = field.get('name', 'Unknown')
-                    field_value = field.get('value', 'Empty')
-
-                    # Format value based on type
-                    if isinstance(field_value, dict):
-                        field_value = str(field_value)[:50]
-                    elif isinstance(field_value, list):
-                        field_value = f"[{len(field_value)} items]"
-
-                    output += f"  - {field_name}: {field_value}\n"
-
-            # Description preview
-            if 'description' in task and task['description']:
-                desc = task['description'][:100].replace('\n', ' ')
-                output += f"- **Description**: {desc}...\n"
+    All tasks are loaded once into an in-memory columnar store (paged
+    concurrently) and kept for 10 minutes, so follow-up questions on the
+    same lists are answered in milliseconds without new API calls.
 
-            output += "\n"
+    Args:
+        metric: One of:
+                - "count": number of tasks
+                - "cycle_time": days from creation to close (closed tasks)
+                - "age": days since creation (open tasks)
+                - "overdue": days past due date (open overdue tasks)
+                - "field": values of a numeric custom field (set field_name)
+        group_by: "none", "status", "assignee", "list", "week_created",
+                  "week_closed", or the name of a dropdown custom field.
+                  Default: "none"
+        list_ids: Lists to analyze. Example: ["901200567890"]
+        space_id: Analyze every list in this space instead
+        field_name: Numeric custom field for metric="field". Example: "Deal Value"
+        include_closed: Include closed tasks. Default: true
+
+    Returns:
+        Markdown table with count, mean, median, p90, min, max (and sum) per group
+
+    Example usage:
+        - "Average cycle time per status in list X"
+        - "Tasks created per week in space Y"
+        - "Distribution of Deal Value by Stage"
+        - "Who has the most overdue tasks?"
+    """
+    try:
+        if space_id:
+            list_ids = [str(lst.get("id")) for lst in await get_space_lists(space_id)]
+        if not list_ids:
+            return "Error: Provide list_ids or space_id."
+
+        started = time.monotonic()
+        store = await load_task_store(list_ids, include_closed)
+        loaded = time.monotonic()
+
+        values, unit = metric_values(store, metric, field_name)
+        rows, codes, label = group_codes(store, group_by)
+        groups = grouped_stats(values, rows, codes)
+        computed = time.monotonic()
+
+        output = f"# Task Analytics: {metric}"
+        output += f" by {group_by}\n\n" if group_by not in ("", "none") else "\n\n"
+        output += f"**Tasks in store**: {store.size} from {len(list_ids)} list(s)\n"
+        output += f"**Load**: {(loaded - started) * 1000:.0f} ms, "
+        output += f"**compute**: {(computed - loaded) * 1000:.1f} ms\n\n"
+
+        if not groups:
+            output += "No tasks have values for this metric.\n"
+            return output
+
+        # Weeks read chronologically, everything else largest group first
+        if group_by.startswith("week"):
+            groups.sort(key=lambda g: g[0])
+        else:
+            groups.sort(key=lambda g: -g[1])
+
+        if metric == "count":
+            output += "| Group | Tasks |\n|---|---|\n"
+            for code, n, _ in groups:
+                output += f"| {label(code)} | {n} |\n"
+        else:
+            output += f"Values in {unit}.\n\n"
+            output += "| Group | n | Mean | Median | p90 | Min | Max | Sum |\n"
+            output += "|---|---|---|---|---|---|---|---|\n"
+            for code, n, stats in groups:
+                mean, p50, p90, low, high, total = stats
+                output += (
+                    f"| {label(code)} | {n} | {mean:.2f} | {p50:.2f} | {p90:.2f} "
+                    f"| {low:.2f} | {high:.2f} | {total:.2f} |\n"
+                )
 
         return truncate_if_needed(output)
 
     except Exception as e:
-        return f"Error getting tasks: {str(e)}"
+        return f"Error computing task analytics: {str(e)}"
 
 
 @mcp.tool()
-async def get_views(space_id: str) -> str:
+@guarded_tool(deadline=LONG_TOOL_DEADLINE_SECONDS)
+async def get_time_in_status(
+    list_id: Optional[str] = None,
+    team_id: Optional[str] = None,
+    statuses: Optional[list[str]] = None,
+    assignees: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+    space_ids: Optional[list[str]] = None,
+    list_ids: Optional[list[str]] = None,
+    date_updated_gt: Optional[str] = None,
+    include_closed: bool = True,
+    max_tasks: int = 2000
+) -> str:
     """
-    Get all views (including dashboards) in a space.
+    Measure how long tasks spend in each status, with lead and cycle times.
 
-    Views include Board, List, Calendar, Gantt, and Dashboard views.
-    This helps understand how the client visualizes and organizes their data.
+    Task IDs are streamed from a list or a workspace task query and sent to
+    ClickUp's bulk time-in-status endpoint in batches of 100 while paging
+    continues, so thousands of tasks take a few dozen requests.
 
     Args:
-        space_id: The space ID. Get from get_spaces tool.
-                  Example: "90120012345"
+        list_id: Analyze all tasks in this list. Example: "901200567890"
+        team_id: Or query tasks across this workspace with the filters below
+        statuses: Only tasks currently in these statuses (team query)
+        assignees: Only tasks assigned to these user IDs (team query)
+        tags: Only tasks with these tags (team query)
+        space_ids: Restrict the team query to these spaces
+        list_ids: Restrict the team query to these lists
+        date_updated_gt: Only tasks updated after this date (YYYY-MM-DD or Unix ms)
+        include_closed: Include closed tasks. Default: true
+        max_tasks: Maximum number of tasks to analyze (1-10000). Default: 2000
 
     Returns:
-        Markdown formatted list of views with their types and configurations
+        Markdown table of per-status dwell times (median, p90, mean, max,
+        total) plus lead time and cycle time percentiles per task
 
     Use this tool to:
-    - Discover existing dashboards and views
-    - Understand data visualization preferences
-    - Identify reporting patterns
-    - Plan dashboard improvements
+    - Find bottleneck statuses in a process
+    - Measure cycle time for a team or list
+    - Compare how long work waits in review vs. in progress
 
     Example usage:
-        - "What views exist in this space?"
-        - "Show me the dashboards"
-        - "List all views in Austin's workspace"
+        - "Where do tasks in list X get stuck?"
+        - "What's the cycle time for tasks tagged bug updated this quarter?"
     """
     try:
-        data = await make_api_request(f"/space/{space_id}/view")
-        views = data.get("views", [])
+        if not list_id and not team_id:
+            return "Error: Provide list_id or team_id."
+        max_tasks = max(1, min(max_tasks, TIME_IN_STATUS_MAX_TASKS))
 
-        if not views:
-            return "No views found in this space."
+        params: dict[str, Any] = {
+            "subtasks": "true",
+            "include_closed": str(include_closed).lower()
+        }
+        if list_id:
+            endpoint = f"/list/{list_id}/task"
+        else:
+            endpoint = f"/team/{team_id}/task"
+            params.update(task_filter_params(statuses, assignees, tags, space_ids, list_ids))
+        timestamp = parse_date_ms(date_updated_gt)
+        if timestamp is not None:
+            params["date_updated_gt"] = timestamp
+
+        stats = StatusDwellStats()
+        semaphore = asyncio.Semaphore(TIME_IN_STATUS_CONCURRENCY)
+        batches: list[asyncio.Task] = []
+        failures: list[Exception] = []
+        collected = 0
+
+        async def fetch_batch(task_ids: list[str]) -> None:
+            async with semaphore:
+                try:
+                    results = await fetch_time_in_status(task_ids)
+                except Exception as e:
+                    failures.append(e)
+                    return
+            for task_status in results.values():
+                stats.add(task_status)
+
+        # Batches are fetched while later pages are still being read
+        batch: list[str] = []
+        max_pages = -(-max_tasks // TASK_PAGE_SIZE)
+        pages = iter_task_pages(endpoint, params=params, max_pages=max_pages)
+        try:
+            try:
+                async for page_tasks in pages:
+                    for task in page_tasks[:max_tasks - collected]:
+                        batch.append(task["id"])
+                        if len(batch) == TIME_IN_STATUS_BATCH:
+                            batches.append(asyncio.create_task(fetch_batch(batch)))
+                            batch = []
+                    collected = min(collected + len(page_tasks), max_tasks)
+                    if collected >= max_tasks:
+                        break
+            except DeadlineExceeded as e:
+                failures.append(e)
+            finally:
+                await pages.aclose()
+            if batch:
+                batches.append(asyncio.create_task(fetch_batch(batch)))
+            await asyncio.gather(*batches)
+        finally:
+            for pending in batches:
+                pending.cancel()
+
+        if not stats.tasks:
+            if failures:
+                raise failures[0]
+            return "No tasks found to analyze."
+
+        output = incomplete_notice() if any(isinstance(e, DeadlineExceeded) for e in failures) else ""
+        output += "# Time in Status\n\n"
+        output += f"**Tasks analyzed**: {stats.tasks}"
+        output += f" (limit of {max_tasks} reached)\n" if collected >= max_tasks else "\n"
+        output += f"**Bulk requests**: {len(batches)}\n"
+        failed_batches = [e for e in failures if not isinstance(e, DeadlineExceeded)]
+        if failed_batches:
+            output += f"**Failed batches**: {len(failed_batches)} ({str(failed_batches[0])})\n"
+        output += "\n## Dwell Time per Status\n\n"
+        output += "| Status | Type | Visits | Median | p90 | Mean | Max | Total | Tasks now |\n"
+        output += "|---|---|---|---|---|---|---|---|---|\n"
+        for status, status_type, visits, (mean, p50, p90, high, total) in stats.summary():
+            output += (
+                f"| {status} | {status_type} | {visits} | {format_minutes(p50)} | {format_minutes(p90)} "
+                f"| {format_minutes(mean)} | {format_minutes(high)} | {format_minutes(total)} "
+                f"| {stats.current.get(status, 0)} |\n"
+            )
+
+        output += "\n## Per-Task Times\n\n"
+        output += "| Measure | Median | p90 | Mean | Max |\n|---|---|---|---|---|\n"
+        for label, values in (
+            ("Lead time (all non-closed statuses)", stats.lead_times),
+            ("Cycle time (excluding not-started statuses)", stats.cycle_times)
+        ):
+            values = np.asarray(values)
+            p50, p90 = np.percentile(values, [50, 90])
+            output += (
+                f"| {label} | {format_minutes(p50)} | {format_minutes(p90)} "
+                f"| {format_minutes(values.mean())} | {format_minutes(values.max())} |\n"
+            )
+
+        return truncate_if_needed(output)
+
+    except Exception as e:
+        return f"Error getting time in status: {str(e)}"
 
-        output = f"# Views ({len(views)} total)\n\n"
 
-        # Group by type
-        view_types = {}
-        for view in views:
-            view_type = view.get('type', 'unknown')
-            if view_type not in view_types:
-                view_types[view_type] = []
-            view_types[view_type].append(view)
+@mcp.tool()
+@guarded_tool(deadline=LONG_TOOL_DEADLINE_SECONDS)
+async def get_time_report(
+    team_id: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    assignees: Optional[list[str]] = None,
+    space_id: Optional[str] = None,
+    folder_id: Optional[str] = None,
+    list_id: Optional[str] = None,
+    top: int = 15
+) -> str:
+    """
+    Summarize tracked time for a period: total and billable hours per user,
+    per list, and per task.
 
-        for view_type, type_views in view_types.items():
-            output += f"## {view_type.title()} Views ({len(type_views)})\n\n"
+    The period is split into 7-day windows that are fetched concurrently and
+    folded into running totals as they arrive, so long periods stay fast and
+    raw time entries are never returned.
 
-            for view in type_views:
-                view_name = view.get('name', 'Unnamed View')
-                view_id = view.get('id')
+    Args:
+        team_id: The workspace (team) ID. Get from get_authorized_user tool.
+                 Example: "9012345678"
+        start_date: Period start (YYYY-MM-DD or Unix ms). Default: 30 days ago
+        end_date: Period end, exclusive (YYYY-MM-DD or Unix ms). Default: now
+        assignees: User IDs to include. Default: only the API key's user
+                   (workspace admins can pass other members' IDs)
+        space_id: Only time on tasks in this space
+        folder_id: Only time on tasks in this folder
+        list_id: Only time on tasks in this list
+        top: Rows to show per breakdown (1-100). Default: 15
 
-                output += f"### {view_name}\n"
-                output += f"- **View ID**: `{view_id}`\n"
-                output += f"- **Type**: {view_type}\n"
+    Returns:
+        Markdown report with total, billable and running-timer counts, and
+        the top users, lists, and tasks by hours
 
-                # Protected/private
-                if 'protected' in view:
-                    output += f"- **Protected**: {view.get('protected', False)}\n"
+    Use this tool to:
+    - Audit billable vs. non-billable hours
+    - See where a team's time went in a month
+    - Find tasks that absorb the most tracked time
 
-                # Parent info
-                if 'parent' in view:
-                    parent = view['parent']
-                    output += f"- **Parent**: {parent.get('name', 'N/A')} (ID: {parent.get('id')})\n"
+    Example usage:
+        - "How many billable hours did users 183 and 184 log in January?"
+        - "Time tracked in space 90120012345 over the last 2 weeks"
+    """
+    try:
+        top = max(1, min(top, 100))
+        end_ms = parse_date_ms(end_date) or int(time.time() * 1000)
+        start_ms = parse_date_ms(start_date) or end_ms - 30 * DAY_MS
+        if start_ms >= end_ms:
+            return "Error: start_date must be before end_date."
+        if end_ms - start_ms > TIME_ENTRY_MAX_DAYS * DAY_MS:
+            return f"Error: The period is limited to {TIME_ENTRY_MAX_DAYS} days."
+
+        params: dict[str, Any] = {"include_location_names": "true"}
+        if assignees:
+            params["assignee"] = ",".join(assignees)
+        for key, value in (("space_id", space_id), ("folder_id", folder_id), ("list_id", list_id)):
+            if value:
+                params[key] = value
+
+        windows = []
+        window_start = start_ms
+        while window_start < end_ms:
+            window_end = min(window_start + TIME_ENTRY_WINDOW_DAYS * DAY_MS, end_ms)
+            windows.append((window_start, window_end))
+            window_start = window_end
+
+        await member_directory.ensure()
+        report = TimeReport()
+
+        async def fetch_window(window: tuple[int, int]) -> None:
+            data = await make_api_request(
+                f"/team/{team_id}/time_entries",
+                params={**params, "start_date": window[0], "end_date": window[1] - 1}
+            )
+            report.add(data.get("data", []), end_ms)
 
-                # Settings preview
-                if 'settings' in view and view['settings']:
-                    output += f"- **Configured**: Yes\n"
+        results = await gather_with_concurrency(fetch_window(window) for window in windows)
+        failures = [r for r in results if isinstance(r, BaseException)]
+        if len(failures) == len(windows):
+            raise failures[0]
 
-                output += "\n"
+        period = (
+            f"{datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc):%Y-%m-%d} – "
+            f"{datetime.fromtimestamp(end_ms / 1000, tz=timezone.utc):%Y-%m-%d}"
+        )
+        output = incomplete_notice() if any(isinstance(e, DeadlineExceeded) for e in failures) else ""
+        output += f"# Time Report: {period}\n\n"
+        output += f"**Total**: {report.total_ms / 3_600_000:.2f} h across {report.entries} entries\n"
+        billable_share = report.billable_ms / report.total_ms * 100 if report.total_ms else 0
+        output += f"**Billable**: {report.billable_ms / 3_600_000:.2f} h ({billable_share:.1f}%)\n"
+        if report.running:
+            output += f"**Running timers**: {report.running} (counted up to now or the period end)\n"
+        failed_windows = [e for e in failures if not isinstance(e, DeadlineExceeded)]
+        if failed_windows:
+            output += f"**Failed windows**: {len(failed_windows)} of {len(windows)} ({str(failed_windows[0])})\n"
+
+        if not report.entries:
+            output += "\nNo time entries in this period."
+            if not assignees:
+                output += " Only your own entries are included unless `assignees` is set."
+            return output + "\n"
+
+        output += format_time_totals("By User", report.by_user, report.total_ms, top, report.labels)
+        output += format_time_totals("By List", report.by_list, report.total_ms, top, report.labels)
+        output += format_time_totals("By Task", report.by_task, report.total_ms, top)
 
         return truncate_if_needed(output)
 
     except Exception as e:
-        return f"Error getting views: {str(e)}"
+        return f"Error getting time report: {str(e)}"
 
 
 # Run the server with stdio transport (for Claude Desktop)
+async def main() -> None:
+    """Start the configured cache warmup, then serve over stdio."""
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    loop_monitor.start()
+    start_warmup()
+    await mcp.run_async(transport="stdio")
+
+
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    asyncio.run(main())